@@ -8,6 +8,7 @@ os.environ.setdefault("PYTORCH_ENABLE_MPS_FALLBACK", "1")
 
 import json
 import socket
+import struct
 from dataclasses import dataclass
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from typing import Optional, Dict, Any, List, Tuple
@@ -52,6 +53,11 @@ def resolve_tracker_path(tracker_name_or_path: str) -> str:
     return tracker_name_or_path
 
 
+# Header of the <camera>_latest.bgr files written by phonecamstream/frame_receiver.py
+# (timestamp, jpeg length, width, height); keep the two in sync.
+DECODED_HEADER = struct.Struct("<dIII")
+
+
 @dataclass
 class FramePacket:
     camera_id: str
@@ -87,6 +93,10 @@ class CameraSource:
         if self.is_file:
             self.cap = None
             self._last_mtime: float = 0.0
+            # frame_receiver.py also saves each frame pre-decoded (<name>.bgr)
+            # when it has libjpeg-turbo; prefer that and skip the JPEG decode
+            self._decoded_path = os.path.splitext(source)[0] + ".bgr"
+            self._last_decoded_key: Optional[Tuple[float, int]] = None
             print(f"[INFO] File-polling source: {source}")
             if not os.path.isfile(source):
                 print(f"[WARN] File does not exist yet — will wait for frame_receiver to create it")
@@ -133,14 +143,20 @@ class CameraSource:
             mtime = os.path.getmtime(self.source)
         except OSError:
             return None
-        # Only return a new frame when the file has actually been updated
-        if mtime <= self._last_mtime:
-            return None
-        self._last_mtime = mtime
-        try:
-            frame = cv2.imread(self.source)
-        except Exception:
-            return None
+        decoded, frame = self._read_decoded()
+        if decoded:
+            if frame is None:
+                return None
+            self._last_mtime = mtime  # the JPEG it was decoded from is consumed too
+        else:
+            # Only return a new frame when the file has actually been updated
+            if mtime <= self._last_mtime:
+                return None
+            self._last_mtime = mtime
+            try:
+                frame = cv2.imread(self.source)
+            except Exception:
+                return None
         if frame is None:
             return None
         ts = time.time()
@@ -149,6 +165,32 @@ class CameraSource:
         self._frame_index += 1
         return pkt
 
+    def _read_decoded(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Read the .bgr copy of the current JPEG (see DECODED_HEADER). Returns
+        (decoded, frame): decoded is False when there is no copy matching the
+        JPEG on disk; frame is None when that copy was already returned.
+        """
+        try:
+            with open(self._decoded_path, "rb") as f:
+                header = f.read(DECODED_HEADER.size)
+                if len(header) != DECODED_HEADER.size:
+                    return False, None
+                timestamp, jpeg_len, width, height = DECODED_HEADER.unpack(header)
+                # A copy of a different (newer or older) JPEG is not used
+                if jpeg_len != os.path.getsize(self.source):
+                    return False, None
+                key = (timestamp, jpeg_len)
+                if key == self._last_decoded_key:
+                    return True, None
+                data = np.fromfile(f, dtype=np.uint8, count=width * height * 3)
+        except OSError:
+            return False, None
+        if data.size != width * height * 3:
+            return False, None
+        self._last_decoded_key = key
+        return True, data.reshape(height, width, 3)
+
     def read(self) -> Optional[FramePacket]:
         if self.is_file:
             return self._read_file()
@@ -6,7 +6,7 @@ from fusion.schemas import (
     global_tracks_output,
 )
 from fusion.fusion_engine import FusionEngine
-from fusion.projection import project_detection_to_world
+from fusion.projection import project_detection_to_world, project_frame_to_world
 from fusion.distance import distance_from_bbox
 
 __all__ = [
@@ -17,5 +17,6 @@ __all__ = [
     "global_tracks_output",
     "FusionEngine",
     "project_detection_to_world",
+    "project_frame_to_world",
     "distance_from_bbox",
 ]
@@ -13,10 +13,10 @@ import os
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, ROOT)
 
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, send_from_directory
 
-# Reuse the data-generation logic from the main viz
-from fusion.viz.app import get_fusion_data
+# Reuse the data-generation logic (and its payload cache) from the main viz
+from fusion.viz.app import app as viz_app, map_response
 
 app = Flask(__name__, static_folder="static", static_url_path="")
 
@@ -26,9 +26,15 @@ def index():
     return send_from_directory(app.static_folder, "index.html")
 
 
+@app.route("/feeds.js")
+def feeds_js():
+    # One payload decoder for both pages; it lives with the viz
+    return send_from_directory(viz_app.static_folder, "feeds.js")
+
+
 @app.route("/api/map")
 def api_map():
-    return jsonify(get_fusion_data())
+    return map_response()
 
 
 def main():
@@ -653,7 +653,7 @@
     fetch("/api/map")
       .then(function (r) { return r.json(); })
       .then(function (d) {
-        _data = d;
+        _data = window.expandFeeds(d);  // feeds.js
         _step = 0;
         var cams = d.cameras || [];
         if (cams.length > 0) {
@@ -16,6 +16,7 @@ This is the "brain" that replaces random dot movement: real camera
 detections go in, map positions come out.
 """
 
+import cmath
 import math
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
@@ -93,8 +94,9 @@ def estimate_position(
     world_bearing_rad = heading_rad + angle_offset_rad
 
     # --- Step 4: project to world ---
-    world_x = camera.x + dist_m * math.cos(world_bearing_rad)
-    world_y = camera.y + dist_m * math.sin(world_bearing_rad)
+    offset = cmath.rect(dist_m, world_bearing_rad)
+    world_x = camera.x + offset.real
+    world_y = camera.y + offset.imag
 
     return PositionEstimate(
         world_x=world_x,
@@ -117,10 +119,10 @@ def is_in_fov(
     """Check whether a world point falls inside the camera's field of view."""
     dx = world_x - camera.x
     dy = world_y - camera.y
-    dist = math.sqrt(dx * dx + dy * dy)
-    if dist > max_range:
+    dist_sq = dx * dx + dy * dy
+    if dist_sq > max_range * max_range:
         return False
-    if dist < 1e-6:
+    if dist_sq < 1e-12:
         return True
     angle_to_target = math.atan2(dy, dx)
     heading_rad = math.radians(camera.heading_deg)
@@ -146,7 +148,7 @@ def world_to_bbox(
 
     dx = world_x - camera.x
     dy = world_y - camera.y
-    dist_m = math.sqrt(dx * dx + dy * dy)
+    dist_m = math.hypot(dx, dy)
     if dist_m < 0.1:
         dist_m = 0.1
 
@@ -180,7 +182,4 @@ def estimation_error(
     true_y: float,
 ) -> float:
     """Euclidean error between estimated and true position (metres)."""
-    return math.sqrt(
-        (estimated.world_x - true_x) ** 2
-        + (estimated.world_y - true_y) ** 2
-    )
+    return math.hypot(estimated.world_x - true_x, estimated.world_y - true_y)
@@ -23,13 +23,13 @@ import sys
 import os
 import argparse
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Ensure repo root on path
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
 
-from fusion.schemas import CameraState, CameraFrame, TrackDetection
+from fusion.schemas import CameraState, CameraFrame
 from fusion.camera_estimator import CameraConfig, estimate_position, world_to_bbox
 from fusion.fusion_engine import FusionEngine
 from fusion.mock_person1 import get_ground_truth_positions
@@ -44,6 +44,7 @@ IMAGE_WIDTH = 640
 IMAGE_HEIGHT = 480
 HFOV_DEG = 60.0
 CONE_RANGE = 8.0       # metres — max detection range per camera
+CONE_RANGE_SQ = CONE_RANGE * CONE_RANGE
 NUM_PEOPLE = 3
 
 # 3 fixed cameras + 1 mobile patrol camera
@@ -136,6 +137,31 @@ class CameraFeedPipeline:
         timestamp : float
             Current simulation / real time in seconds.
         """
+        self._engine.process_frame(self._camera_frame(camera, bboxes, timestamp))
+
+    def process_frame_multi(
+        self,
+        camera_detections: Iterable[Tuple[CameraConfig, List[dict]]],
+        timestamp: float,
+    ) -> None:
+        """
+        Feed one tick's detections from every camera in a single call.
+
+        ``camera_detections`` is a sequence of ``(camera, bboxes)`` pairs,
+        each as for :meth:`process_camera_frame`. Equivalent to calling that
+        per camera, except the engine drops stale tracks once per tick.
+        """
+        self._engine.process_frames([
+            self._camera_frame(camera, bboxes, timestamp)
+            for camera, bboxes in camera_detections
+        ])
+
+    def _camera_frame(
+        self,
+        camera: CameraConfig,
+        bboxes: List[dict],
+        timestamp: float,
+    ) -> CameraFrame:
         # Make sure engine knows about this camera's current state
         self._engine.update_camera_state(CameraState(
             agent_id=camera.camera_id,
@@ -144,20 +170,10 @@ class CameraFeedPipeline:
             timestamp=timestamp,
         ))
 
-        tracks = [
-            TrackDetection(
-                track_id=b["track_id"],
-                bbox=b["bbox"],
-                confidence=b["confidence"],
-            )
-            for b in bboxes
-        ]
-        frame = CameraFrame(
-            camera_id=camera.camera_id,
-            timestamp=timestamp,
-            tracks=tracks,
-        )
-        self._engine.process_frame(frame)
+        frame = CameraFrame(camera_id=camera.camera_id, timestamp=timestamp)
+        for b in bboxes:
+            frame.append(b["track_id"], b["bbox"], b["confidence"])
+        return frame
 
     def get_tracked_persons(self, now: float) -> List[TrackedPerson]:
         """
@@ -241,6 +257,40 @@ class CameraFeedPipeline:
 #  Simulated camera feed generator
 # ──────────────────────────────────────────────────────────────
 
+def simulate_detection(
+    camera: CameraConfig,
+    person_id: int,
+    position: List[float],
+) -> Optional[dict]:
+    """
+    Simulated {track_id, bbox, confidence} for one person the camera has
+    range + LOS to; None if the person is outside the camera's FOV.
+    """
+    dx = position[0] - camera.x
+    dy = position[1] - camera.y
+    dist = math.hypot(dx, dy)
+
+    # Compute bbox (returns None if outside FOV)
+    bbox = world_to_bbox(camera, position[0], position[1])
+    if bbox is None:
+        return None
+
+    # Clamp to image bounds
+    bbox = [
+        max(0.0, min(float(camera.image_width), bbox[0])),
+        max(0.0, min(float(camera.image_height), bbox[1])),
+        max(0.0, min(float(camera.image_width), bbox[2])),
+        max(0.0, min(float(camera.image_height), bbox[3])),
+    ]
+
+    conf = 0.85 + 0.1 * math.sin(dist * 0.7)
+    return {
+        "track_id": person_id,
+        "bbox": bbox,
+        "confidence": min(1.0, conf),
+    }
+
+
 def simulate_camera_detections(
     camera: CameraConfig,
     ground_truth: List[dict],
@@ -256,40 +306,22 @@ def simulate_camera_detections(
     detections = []
     cam_pos = (camera.x, camera.y)
     for gt in ground_truth:
-        pid = gt["id"]
         pos = gt["position"]
         target = (pos[0], pos[1])
 
         # Range gate
         dx = pos[0] - camera.x
         dy = pos[1] - camera.y
-        dist = math.sqrt(dx * dx + dy * dy)
-        if dist > CONE_RANGE:
+        if dx * dx + dy * dy > CONE_RANGE_SQ:
             continue
 
         # Wall occlusion
         if not has_los(cam_pos, target, walls):
             continue
 
-        # Compute bbox (returns None if outside FOV)
-        bbox = world_to_bbox(camera, pos[0], pos[1])
-        if bbox is None:
-            continue
-
-        # Clamp to image bounds
-        bbox = [
-            max(0.0, min(float(camera.image_width), bbox[0])),
-            max(0.0, min(float(camera.image_height), bbox[1])),
-            max(0.0, min(float(camera.image_width), bbox[2])),
-            max(0.0, min(float(camera.image_height), bbox[3])),
-        ]
-
-        conf = 0.85 + 0.1 * math.sin(dist * 0.7)
-        detections.append({
-            "track_id": pid,
-            "bbox": bbox,
-            "confidence": min(1.0, conf),
-        })
+        det = simulate_detection(camera, gt["id"], pos)
+        if det is not None:
+            detections.append(det)
 
     return detections
 
@@ -299,7 +331,7 @@ def simulate_camera_detections(
 # ──────────────────────────────────────────────────────────────
 
 def _dist(a, b):
-    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+    return math.hypot(a[0] - b[0], a[1] - b[1])
 
 
 def run_demo(seconds: float = 10.0, fps: float = 5.0, verbose: bool = True):
@@ -351,9 +383,10 @@ def run_demo(seconds: float = 10.0, fps: float = 5.0, verbose: bool = True):
         # ── Step 2: Each camera produces bboxes (the only data we feed in) ──
         all_detections: Dict[str, List[dict]] = {}
         for cam in cameras:
-            dets = simulate_camera_detections(cam, ground_truth, WALLS)
-            all_detections[cam.camera_id] = dets
-            pipeline.process_camera_frame(cam, dets, t)
+            all_detections[cam.camera_id] = simulate_camera_detections(cam, ground_truth, WALLS)
+        pipeline.process_frame_multi(
+            [(cam, all_detections[cam.camera_id]) for cam in cameras], t,
+        )
 
         # ── Step 3: Read fused tracks + last-seen positions ──
         tracked = pipeline.get_tracked_persons(t)
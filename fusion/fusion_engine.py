@@ -2,16 +2,18 @@
 Multi-camera fusion: merge per-camera world projections into global tracks.
 
 - Maintain global track table (id -> position, confidence, last_seen, source_cameras).
-- Match new detections to existing tracks by radius gate.
+- Match a frame's detections to existing tracks in one optimal assignment
+  (Hungarian), gated by the match radius.
 - Weighted average position by confidence; aggregate confidence; update last_seen.
 - TTL: drop tracks not seen for a while.
 """
 
 import math
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from fusion.schemas import CameraFrame, CameraState, GlobalTrack, TrackDetection
-from fusion.projection import project_detection_to_world
+from fusion.matching import min_cost_assignment
+from fusion.projection import project_frame_to_world
 
 # Match radius in meters: detections within this distance merge into same track
 MATCH_RADIUS_M = 3.0
@@ -19,10 +21,6 @@ MATCH_RADIUS_M = 3.0
 TRACK_TTL_SEC = 5.0
 
 
-def _dist(world_a: List[float], world_b: List[float]) -> float:
-    return math.sqrt((world_a[0] - world_b[0]) ** 2 + (world_a[1] - world_b[1]) ** 2)
-
-
 class FusionEngine:
     def __init__(
         self,
@@ -42,34 +40,45 @@ class FusionEngine:
         return self._camera_states.get(camera_id)
 
     def process_frame(self, frame: CameraFrame) -> None:
+        self.process_frames((frame,))
+
+    def process_frames(self, frames: Iterable[CameraFrame]) -> None:
+        """
+        Process one tick's frames from several cameras in one call. Frames
+        are associated in turn, so cameras seeing the same person still
+        merge into one track; stale tracks are then dropped once, at the
+        latest timestamp, instead of after every camera.
+        """
+        now = None
+        for frame in frames:
+            if self._associate(frame):
+                now = frame.timestamp if now is None else max(now, frame.timestamp)
+        if now is not None:
+            self._drop_stale(now)
+
+    def _associate(self, frame: CameraFrame) -> bool:
+        """Match/merge one frame's detections into the tracks; False if its camera is unknown."""
         camera = self.get_camera_state(frame.camera_id)
         if not camera:
-            return
+            return False
         now = frame.timestamp
-        # Project each detection to world
-        candidates: List[tuple] = []
-        for t in frame.tracks:
-            try:
-                wx, wy, conf = project_detection_to_world(t, camera)
-                candidates.append((wx, wy, conf, frame.camera_id))
-            except Exception:
-                continue
-        # Match or create global tracks
-        used = set()
-        for (wx, wy, conf, cam_id) in candidates:
-            pos = [wx, wy]
-            best_id = None
-            best_dist = self.match_radius_m
-            for gid, gt in self._global_tracks.items():
-                if gid in used:
-                    continue
-                d = _dist(gt.position, pos)
-                if d < best_dist:
-                    best_dist = d
-                    best_id = gid
-            if best_id is not None:
+        cam_id = frame.camera_id
+        # 1) Project every detection of the frame to world in one pass
+        detections = project_frame_to_world(frame, camera)
+        # 2) One detection x track distance matrix, 3) one optimal assignment
+        #    (pairs at or beyond the match radius are gated out)
+        tracks = list(self._global_tracks.values())
+        cost = [
+            [math.hypot(gt.position[0] - wx, gt.position[1] - wy) for gt in tracks]
+            for (wx, wy, _conf) in detections
+        ]
+        matched = dict(min_cost_assignment(cost, max_cost=self.match_radius_m))
+        # 4) Merge matched detections, start new tracks for the rest
+        for di, (wx, wy, conf) in enumerate(detections):
+            ti = matched.get(di)
+            if ti is not None:
                 # Merge into existing track (weighted average by confidence)
-                gt = self._global_tracks[best_id]
+                gt = tracks[ti]
                 w_old = gt.confidence
                 w_new = conf
                 total = w_old + w_new
@@ -81,7 +90,6 @@ class FusionEngine:
                 gt.last_seen = now
                 if cam_id not in gt.source_cameras:
                     gt.source_cameras.append(cam_id)
-                used.add(best_id)
             else:
                 # New global track
                 self._global_tracks[self._next_global_id] = GlobalTrack(
@@ -92,6 +100,9 @@ class FusionEngine:
                     source_cameras=[cam_id],
                 )
                 self._next_global_id += 1
+        return True
+
+    def _drop_stale(self, now: float) -> None:
         # TTL: remove stale tracks
         to_drop = [
             gid for gid, gt in self._global_tracks.items()
@@ -0,0 +1,117 @@
+"""
+Optimal one-to-one matching (Hungarian algorithm).
+
+Same result as scipy.optimize.linear_sum_assignment on a dense cost
+matrix, plus a gate: pairs whose cost is >= max_cost are never matched.
+Uses scipy when it is installed, else a stdlib solver.
+Used to associate detections with tracks in a single pass per frame.
+"""
+
+import math
+from typing import List, Sequence, Tuple
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # optional: the stdlib solver below is used instead
+    linear_sum_assignment = None
+
+
+def min_cost_assignment(
+    cost: Sequence[Sequence[float]],
+    max_cost: float = math.inf,
+) -> List[Tuple[int, int]]:
+    """
+    Assign rows to columns (each used at most once) minimising total cost.
+
+    cost[i][j] is the cost of pairing row i with column j; the matrix may be
+    rectangular. Pairs with cost >= max_cost are gated out, so rows/columns
+    with no admissible partner stay unassigned. Among assignments with the
+    most admissible pairs, the cheapest one is returned.
+    Returns [(row, col), ...] sorted by row.
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    if n == 0 or m == 0:
+        return []
+
+    # Common case: no row or column has two admissible partners, so the
+    # admissible pairs are disjoint and form the only optimal assignment.
+    pairs = []
+    used_cols = set()
+    for i, row in enumerate(cost):
+        admissible = [j for j, c in enumerate(row) if c < max_cost]
+        if not admissible:
+            continue
+        if len(admissible) > 1 or admissible[0] in used_cols:
+            break
+        used_cols.add(admissible[0])
+        pairs.append((i, admissible[0]))
+    else:
+        return pairs
+
+    # Gated pairs get a penalty larger than any admissible total, so the
+    # solver only uses them when a row has nothing better; dropped below.
+    big = 1.0 + sum(abs(c) for row in cost for c in row if c < max_cost)
+    if linear_sum_assignment is not None:
+        a = [[c if c < max_cost else big for c in row] for row in cost]
+        rows, cols = linear_sum_assignment(a)
+        return [
+            (i, j) for i, j in zip(rows.tolist(), cols.tolist())
+            if cost[i][j] < max_cost
+        ]
+
+    transposed = n > m
+    if transposed:
+        cost = [list(col) for col in zip(*cost)]
+        n, m = m, n
+    a = [[c if c < max_cost else big for c in row] for row in cost]
+
+    # Shortest augmenting path with row/column potentials, O(n^2 m).
+    # Index 0 is a virtual column; p[j] is the row matched to column j.
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [math.inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = a[i0 - 1]
+            delta = math.inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    pairs = [
+        (p[j] - 1, j - 1)
+        for j in range(1, m + 1)
+        if p[j] and cost[p[j] - 1][j - 1] < max_cost
+    ]
+    if transposed:
+        pairs = [(col, row) for row, col in pairs]
+    pairs.sort()
+    return pairs
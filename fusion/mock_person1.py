@@ -188,7 +188,7 @@ def generate_frames(
                 make_track(i + 1, t, phase=(hash(cam_id) % 100) / 100.0 + i * 0.5)
                 for i in range(num_tracks_per_camera)
             ]
-            yield CameraFrame(camera_id=cam_id, timestamp=ts, tracks=tracks)
+            yield CameraFrame.from_tracks(cam_id, ts, tracks)
         frame_idx += 1
         time.sleep(1.0 / fps)
 
@@ -210,7 +210,7 @@ def generate_frames_finite(
                 make_track(i + 1, t, phase=(hash(cam_id) % 100) / 100.0 + i * 0.5)
                 for i in range(num_tracks_per_camera)
             ]
-            out.append(CameraFrame(camera_id=cam_id, timestamp=ts, tracks=tracks).to_dict())
+            out.append(CameraFrame.from_tracks(cam_id, ts, tracks).to_dict())
     return out
 
 
@@ -247,5 +247,5 @@ def generate_frames_finite_with_walls(
                 bbox = world_position_to_bbox(wx, wy, camera)
                 conf = 0.85 + 0.1 * math.sin(t * 0.7 + i)
                 tracks.append(TrackDetection(track_id=i + 1, bbox=bbox, confidence=min(1.0, conf)))
-            out.append(CameraFrame(camera_id=cam_id, timestamp=ts, tracks=tracks).to_dict())
+            out.append(CameraFrame.from_tracks(cam_id, ts, tracks).to_dict())
     return out
@@ -6,14 +6,59 @@ Camera at (cx, cy) with heading (degrees). Detection bbox + distance
 """
 
 import math
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
-from fusion.distance import distance_from_bbox
-from fusion.schemas import CameraState, TrackDetection
+from fusion.distance import (
+    DEFAULT_HFOV_DEG,
+    DEFAULT_PERSON_HEIGHT_M,
+    focal_length_px,
+    focal_length_px_vertical,
+)
+from fusion.schemas import CameraFrame, CameraState, TrackDetection
+
+try:
+    import numba
+except ImportError:  # optional: the pure-Python cores below are used as-is
+    numba = None
 
 DEFAULT_IMAGE_WIDTH = 640
 DEFAULT_IMAGE_HEIGHT = 480
 
+# (image_width, image_height, hfov_deg) -> (focal_h, focal_v); image size and
+# FOV practically never change, so each combination is derived only once.
+_FOCAL_CACHE: Dict[Tuple[int, int, float], Tuple[float, float]] = {}
+
+
+def _focal_cache(
+    image_width: int,
+    image_height: int,
+    hfov_deg: float = DEFAULT_HFOV_DEG,
+) -> Tuple[float, float]:
+    """Cached (horizontal, vertical) focal lengths in pixels."""
+    key = (image_width, image_height, hfov_deg)
+    focals = _FOCAL_CACHE.get(key)
+    if focals is None:
+        focals = (
+            focal_length_px(image_width, hfov_deg),
+            focal_length_px_vertical(image_width, image_height, hfov_deg),
+        )
+        _FOCAL_CACHE[key] = focals
+    return focals
+
+
+# Intrinsics for the default image size, computed once at import
+_HALF_W = DEFAULT_IMAGE_WIDTH * 0.5
+_HALF_H = DEFAULT_IMAGE_HEIGHT * 0.5
+_FOCAL_H, _FOCAL_V = _focal_cache(DEFAULT_IMAGE_WIDTH, DEFAULT_IMAGE_HEIGHT)
+
+
+def _intrinsics(image_width: int, image_height: int) -> Tuple[float, float, float, float]:
+    """(focal_h, focal_v, half_w, half_h); the default size needs no work."""
+    if image_width == DEFAULT_IMAGE_WIDTH and image_height == DEFAULT_IMAGE_HEIGHT:
+        return (_FOCAL_H, _FOCAL_V, _HALF_W, _HALF_H)
+    focal_h, focal_v = _focal_cache(int(image_width), int(image_height))
+    return (focal_h, focal_v, image_width * 0.5, image_height * 0.5)
+
 
 def bbox_center(bbox: List[float]) -> Tuple[float, float]:
     x1, y1, x2, y2 = bbox
@@ -29,15 +74,46 @@ def image_offset_to_angle_rad(
     Horizontal angle (radians) from camera optical axis to bbox center.
     Positive = target is to the right of center in image.
     """
-    from fusion.distance import focal_length_px, DEFAULT_HFOV_DEG
     cx_img, _ = bbox_center(bbox)
     center_x = image_width / 2.0
     offset_px = cx_img - center_x
     if focal_px is None:
-        focal_px = focal_length_px(int(image_width), DEFAULT_HFOV_DEG)
+        focal_px = _focal_cache(int(image_width), DEFAULT_IMAGE_HEIGHT)[0]
     return math.atan2(-offset_px, focal_px)
 
 
+def _project_core(
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+    cam_x: float,
+    cam_y: float,
+    cos_h: float,
+    sin_h: float,
+    focal_h: float,
+    focal_v: float,
+    half_w: float,
+    person_height_m: float,
+) -> Tuple[float, float]:
+    """
+    Scalar core of project_detection_to_world on plain floats.
+    Same math as distance_from_bbox + image_offset_to_angle_rad; the
+    camera heading comes in as its (cos, sin) basis vector.
+    """
+    distance_m = (person_height_m * focal_v) / max(abs(y2 - y1), 1.0)
+    lateral_px = half_w - (x1 + x2) / 2.0
+    # The ray (focal_h, lateral_px) already points at the target: scaling it
+    # to length distance_m gives the camera-frame offset without atan2/cos/sin.
+    scale = distance_m / math.hypot(focal_h, lateral_px)
+    local_x = focal_h * scale
+    local_y = lateral_px * scale
+    # Rotate from camera frame into world frame by the heading
+    world_x = cam_x + cos_h * local_x - sin_h * local_y
+    world_y = cam_y + sin_h * local_x + cos_h * local_y
+    return (world_x, world_y)
+
+
 def project_detection_to_world(
     detection: TrackDetection,
     camera: CameraState,
@@ -48,20 +124,43 @@ def project_detection_to_world(
     Project one detection to world (x, y) in meters.
     Returns (world_x, world_y, confidence).
     """
-    distance_m, _ = distance_from_bbox(
-        detection.bbox,
-        image_width=image_width,
-        image_height=image_height,
+    focal_h, focal_v, half_w, _ = _intrinsics(image_width, image_height)
+    x1, y1, x2, y2 = detection.bbox
+    world_x, world_y = _project_core(
+        x1, y1, x2, y2,
+        camera.position[0], camera.position[1], camera.cos_heading, camera.sin_heading,
+        focal_h, focal_v, half_w, DEFAULT_PERSON_HEIGHT_M,
     )
-    angle_offset = image_offset_to_angle_rad(detection.bbox, float(image_width))
-    heading_rad = math.radians(camera.heading)
-    world_angle = heading_rad + angle_offset
-    cam_x, cam_y = camera.position[0], camera.position[1]
-    world_x = cam_x + distance_m * math.cos(world_angle)
-    world_y = cam_y + distance_m * math.sin(world_angle)
     return (world_x, world_y, detection.confidence)
 
 
+def project_frame_to_world(
+    frame: CameraFrame,
+    camera: CameraState,
+    image_width: int = DEFAULT_IMAGE_WIDTH,
+    image_height: int = DEFAULT_IMAGE_HEIGHT,
+) -> List[Tuple[float, float, float]]:
+    """
+    Project all detections of one camera frame, reading its bbox and
+    confidence columns directly. Camera fields and focal lengths are
+    read once per frame instead of once per detection.
+    Returns [(world_x, world_y, confidence), ...] in frame order.
+    """
+    cam_x, cam_y = camera.position
+    cos_h, sin_h = camera.cos_heading, camera.sin_heading
+    focal_h, focal_v, half_w, _ = _intrinsics(image_width, image_height)
+    b = frame.bboxes
+    out: List[Tuple[float, float, float]] = []
+    for i, conf in enumerate(frame.confidences):
+        j = 4 * i
+        world_x, world_y = _project_core(
+            b[j], b[j + 1], b[j + 2], b[j + 3], cam_x, cam_y, cos_h, sin_h,
+            focal_h, focal_v, half_w, DEFAULT_PERSON_HEIGHT_M,
+        )
+        out.append((world_x, world_y, conf))
+    return out
+
+
 def _normalize_angle(angle_rad: float) -> float:
     """Wrap angle to [-pi, pi]."""
     while angle_rad > math.pi:
@@ -71,38 +170,64 @@ def _normalize_angle(angle_rad: float) -> float:
     return angle_rad
 
 
-def world_position_to_bbox(
+def _bbox_core(
     world_x: float,
     world_y: float,
-    camera: "CameraState",
-    image_width: int = DEFAULT_IMAGE_WIDTH,
-    image_height: int = DEFAULT_IMAGE_HEIGHT,
-    person_height_m: float = 1.7,
-) -> List[float]:
-    """
-    Inverse of project_detection_to_world: given world (x,y), compute pixel bbox
-    that would be seen by the camera. Returns [x1, y1, x2, y2].
-    Uses horizontal focal for x-offset, vertical focal for bbox height (consistent with distance_from_bbox).
-    """
-    from fusion.distance import focal_length_px, focal_length_px_vertical, DEFAULT_HFOV_DEG
-    cam_x, cam_y = camera.position[0], camera.position[1]
+    cam_x: float,
+    cam_y: float,
+    heading_rad: float,
+    focal_h: float,
+    focal_v: float,
+    half_w: float,
+    half_h: float,
+    person_height_m: float,
+) -> Tuple[float, float, float, float]:
+    """Scalar core of world_position_to_bbox on plain floats."""
     dx = world_x - cam_x
     dy = world_y - cam_y
-    distance_m = math.sqrt(dx * dx + dy * dy)
+    distance_m = math.hypot(dx, dy)
     if distance_m < 0.1:
         distance_m = 0.1
     world_angle = math.atan2(dy, dx)
-    heading_rad = math.radians(camera.heading)
     angle_offset = _normalize_angle(world_angle - heading_rad)
-    focal_h = focal_length_px(image_width, DEFAULT_HFOV_DEG)
-    focal_v = focal_length_px_vertical(image_width, image_height, DEFAULT_HFOV_DEG)
     offset_px = -focal_h * math.tan(angle_offset)
-    center_x = image_width / 2.0 + offset_px
-    center_y = image_height / 2.0
+    center_x = half_w + offset_px
+    center_y = half_h
     height_px = person_height_m * focal_v / distance_m
     width_px = 50.0
     x1 = center_x - width_px / 2
     y1 = center_y - height_px / 2
     x2 = center_x + width_px / 2
     y2 = center_y + height_px / 2
-    return [x1, y1, x2, y2]
+    return (x1, y1, x2, y2)
+
+
+def world_position_to_bbox(
+    world_x: float,
+    world_y: float,
+    camera: "CameraState",
+    image_width: int = DEFAULT_IMAGE_WIDTH,
+    image_height: int = DEFAULT_IMAGE_HEIGHT,
+    person_height_m: float = 1.7,
+) -> List[float]:
+    """
+    Inverse of project_detection_to_world: given world (x,y), compute pixel bbox
+    that would be seen by the camera. Returns [x1, y1, x2, y2].
+    Uses horizontal focal for x-offset, vertical focal for bbox height (consistent with distance_from_bbox).
+    """
+    focal_h, focal_v, half_w, half_h = _intrinsics(image_width, image_height)
+    return list(_bbox_core(
+        world_x, world_y,
+        camera.position[0], camera.position[1], camera.heading_rad,
+        focal_h, focal_v, half_w, half_h, person_height_m,
+    ))
+
+
+# JIT the scalar cores when numba is installed; warm them up once at import
+# so the first frame does not pay compilation.
+if numba is not None:
+    _normalize_angle = numba.njit(cache=True, fastmath=True)(_normalize_angle)
+    _project_core = numba.njit(cache=True, fastmath=True)(_project_core)
+    _bbox_core = numba.njit(cache=True, fastmath=True)(_bbox_core)
+    _project_core(0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+    _bbox_core(1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0, 1.0)
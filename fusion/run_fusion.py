@@ -9,14 +9,19 @@ Usage:
 """
 
 import argparse
-import json
 import sys
 import os
 
 # Run from repo root or from fusion/
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fusion.schemas import CameraFrame, CameraState, global_tracks_output
+from fusion.schemas import (
+    CameraFrame,
+    CameraState,
+    dumps_json,
+    global_tracks_output,
+    loads_json,
+)
 from fusion.fusion_engine import FusionEngine
 from fusion.mock_person1 import generate_frames_finite
 
@@ -48,8 +53,8 @@ def main():
 
     # Optional: load camera states from file
     if args.camera_state_json and os.path.isfile(args.camera_state_json):
-        with open(args.camera_state_json) as f:
-            for item in json.load(f):
+        with open(args.camera_state_json, "rb") as f:
+            for item in loads_json(f.read()):
                 engine.update_camera_state(CameraState.from_dict(item))
 
     # Ensure we have state for every camera_id we'll see
@@ -61,8 +66,8 @@ def main():
 
     # Person 1 input: from file or mock
     if args.person1_json and os.path.isfile(args.person1_json):
-        with open(args.person1_json) as f:
-            frame_list = json.load(f)
+        with open(args.person1_json, "rb") as f:
+            frame_list = loads_json(f.read())
         for fd in frame_list:
             frame = CameraFrame.from_dict(fd)
             if engine.get_camera_state(frame.camera_id):
@@ -84,11 +89,11 @@ def main():
     payload = global_tracks_output(global_tracks)
 
     if args.out:
-        with open(args.out, "w") as f:
-            json.dump(payload, f, indent=2)
+        with open(args.out, "wb") as f:
+            f.write(dumps_json(payload, indent=True))
         print(f"Wrote {len(global_tracks)} global tracks to {args.out}", file=sys.stderr)
     else:
-        print(json.dumps(payload, indent=2))
+        print(dumps_json(payload, indent=True).decode("utf-8"))
     return 0
 
 
@@ -6,11 +6,13 @@ Launch both visualization servers with one command.
 
 - Fusion Map (global view)      → http://127.0.0.1:5050
 - Camera Perspective View       → http://127.0.0.1:5051
+
+Each server runs in its own process, so they do not share a GIL.
 """
 
 import sys
 import os
-import threading
+from multiprocessing import Process
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
@@ -32,14 +34,14 @@ def main():
     print("  Camera Perspective View  → http://127.0.0.1:5051")
     print()
 
-    t1 = threading.Thread(target=start_global_viz, daemon=True)
-    t2 = threading.Thread(target=start_cam_viz, daemon=True)
-    t1.start()
-    t2.start()
+    p1 = Process(target=start_global_viz, daemon=True)
+    p2 = Process(target=start_cam_viz, daemon=True)
+    p1.start()
+    p2.start()
 
     try:
-        t1.join()
-        t2.join()
+        p1.join()
+        p2.join()
     except KeyboardInterrupt:
         print("\nShutting down both servers.")
         sys.exit(0)
@@ -7,15 +7,39 @@ Contracts:
 - OUTPUT for Person 3: global_tracks (id, position, confidence, last_seen)
 """
 
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Deque, Iterable, List, Optional, Tuple
 import json
+import math
 import time
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+
+def dumps_json(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def loads_json(data):
+    """Parse JSON from bytes, bytearray, memoryview or str (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
 
 # --- Person 1 output (what we consume) ---
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TrackDetection:
     """Single track from one camera frame."""
     track_id: int
@@ -23,53 +47,122 @@ class TrackDetection:
     confidence: float
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraFrame:
-    """One frame of detections from one camera (Person 1 output)."""
+    """
+    One frame of detections from one camera (Person 1 output).
+
+    Stored column-wise: detection i is track_ids[i], bboxes[4*i:4*i+4]
+    and confidences[i]. Flat typed arrays keep a frame's numbers unboxed
+    and contiguous; use `tracks` for per-detection objects.
+    """
     camera_id: str
     timestamp: float  # Unix ms or seconds
-    tracks: List[TrackDetection]
+    track_ids: array = field(default_factory=lambda: array("q"))
+    bboxes: array = field(default_factory=lambda: array("d"))  # [x1, y1, x2, y2, x1, ...]
+    confidences: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def append(self, track_id: int, bbox: List[float], confidence: float) -> None:
+        """Add one detection; bbox must be [x1, y1, x2, y2]."""
+        if len(bbox) != 4:
+            raise ValueError(f"bbox must have 4 values, got {len(bbox)}")
+        self.bboxes.extend(float(v) for v in bbox)
+        self.track_ids.append(track_id)
+        self.confidences.append(float(confidence))
+
+    @property
+    def tracks(self) -> List[TrackDetection]:
+        """Per-detection view, materialized on access."""
+        b = self.bboxes
+        return [
+            TrackDetection(track_id=tid, bbox=b[4 * i:4 * i + 4].tolist(), confidence=conf)
+            for i, (tid, conf) in enumerate(zip(self.track_ids, self.confidences))
+        ]
 
     def to_dict(self):
+        b = self.bboxes
         return {
             "camera_id": self.camera_id,
             "timestamp": self.timestamp,
             "tracks": [
-                {"track_id": t.track_id, "bbox": t.bbox, "confidence": t.confidence}
-                for t in self.tracks
+                {"track_id": tid, "bbox": b[4 * i:4 * i + 4].tolist(), "confidence": conf}
+                for i, (tid, conf) in enumerate(zip(self.track_ids, self.confidences))
             ],
         }
 
+    def to_dict_columnar(self):
+        """Column-wise form: one list per column, bboxes flattened (4 per track)."""
+        return {
+            "camera_id": self.camera_id,
+            "timestamp": self.timestamp,
+            "track_ids": self.track_ids.tolist(),
+            "bboxes": self.bboxes.tolist(),
+            "confidences": self.confidences.tolist(),
+        }
+
+    @classmethod
+    def from_tracks(
+        cls,
+        camera_id: str,
+        timestamp: float,
+        tracks: Iterable[TrackDetection],
+    ) -> "CameraFrame":
+        frame = cls(camera_id=camera_id, timestamp=timestamp)
+        for t in tracks:
+            frame.append(t.track_id, t.bbox, t.confidence)
+        return frame
+
     @classmethod
     def from_dict(cls, d: dict) -> "CameraFrame":
-        return cls(
-            camera_id=d["camera_id"],
-            timestamp=float(d["timestamp"]),
-            tracks=[
-                TrackDetection(
-                    track_id=tr["track_id"],
-                    bbox=list(tr["bbox"]),
-                    confidence=float(tr["confidence"]),
-                )
-                for tr in d["tracks"]
-            ],
-        )
+        """Accepts both the row-wise ("tracks") and the columnar form."""
+        if "tracks" not in d:
+            frame = cls(
+                camera_id=d["camera_id"],
+                timestamp=float(d["timestamp"]),
+                track_ids=array("q", d["track_ids"]),
+                bboxes=array("d", d["bboxes"]),
+                confidences=array("d", d["confidences"]),
+            )
+            n = len(frame.track_ids)
+            if len(frame.confidences) != n or len(frame.bboxes) != 4 * n:
+                raise ValueError("columnar frame: column lengths do not match")
+            return frame
+        frame = cls(camera_id=d["camera_id"], timestamp=float(d["timestamp"]))
+        for tr in d["tracks"]:
+            frame.append(tr["track_id"], tr["bbox"], tr["confidence"])
+        return frame
 
 
 # --- Camera/agent state (position + heading) ---
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CameraState:
     """Position and orientation of a camera/agent in world coordinates."""
     agent_id: str  # same as camera_id in frames
-    position: List[float]  # [x, y] in meters (world)
+    position: Tuple[float, float]  # (x, y) in meters (world); lists are accepted
     heading: float  # degrees, 0 = +x, 90 = +y (or your convention)
     timestamp: float
+    # Derived from heading once per state update, so projection does no
+    # per-detection trig on it.
+    heading_rad: float = field(init=False, repr=False, compare=False)
+    cos_heading: float = field(init=False, repr=False, compare=False)
+    sin_heading: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        x, y = self.position
+        object.__setattr__(self, "position", (float(x), float(y)))
+        heading_rad = math.radians(self.heading)
+        object.__setattr__(self, "heading_rad", heading_rad)
+        object.__setattr__(self, "cos_heading", math.cos(heading_rad))
+        object.__setattr__(self, "sin_heading", math.sin(heading_rad))
 
     def to_dict(self):
         return {
             "agent_id": self.agent_id,
-            "position": self.position,
+            "position": list(self.position),
             "heading": self.heading,
             "timestamp": self.timestamp,
         }
@@ -86,7 +179,11 @@ class CameraState:
 
 # --- Output for Person 3 (Assignment engine) ---
 
-@dataclass
+# Most recent history entries kept per GlobalTrack
+HISTORY_MAXLEN = 128
+
+
+@dataclass(slots=True)
 class GlobalTrack:
     """Fused track in world space."""
     id: int
@@ -94,7 +191,8 @@ class GlobalTrack:
     confidence: float
     last_seen: float  # timestamp
     source_cameras: List[str] = field(default_factory=list)
-    history: List[dict] = field(default_factory=list)  # optional for debugging
+    # Optional for debugging; a ring buffer so long-lived tracks stay bounded
+    history: Deque[dict] = field(default_factory=lambda: deque(maxlen=HISTORY_MAXLEN))
 
     def to_dict(self):
         return {
@@ -115,5 +213,5 @@ def global_tracks_output(global_tracks: List[GlobalTrack]) -> dict:
 
 
 def write_person3_format(global_tracks: List[GlobalTrack], path: str) -> None:
-    with open(path, "w") as f:
-        json.dump(global_tracks_output(global_tracks), f, indent=2)
+    with open(path, "wb") as f:
+        f.write(dumps_json(global_tracks_output(global_tracks), indent=True))
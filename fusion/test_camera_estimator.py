@@ -12,6 +12,8 @@ Run:  python -m fusion.test_camera_estimator
 import json
 import math
 import os
+import random
+import statistics
 import sys
 from typing import List
 
@@ -47,20 +49,32 @@ TEST_POSITIONS = [
 ]
 
 
-def add_bbox_noise(bbox: List[float], noise_px: float = 8.0, seed: int = 0) -> List[float]:
+# Seed for the detection-noise RNG (one generator per test run)
+NOISE_SEED = 1234
+
+
+def add_bbox_noise(
+    bboxes: List[List[float]],
+    noise_px: float = 8.0,
+    seed: int = NOISE_SEED,
+) -> List[List[float]]:
     """
-    Add realistic noise to a bounding box (simulates imperfect detection).
+    Add realistic noise to a batch of bounding boxes (simulates imperfect detection).
     - Shifts centre by up to noise_px
     - Varies height by ±10%
+    One RNG draws all four noise terms per box, in input order.
     """
-    import random
     rng = random.Random(seed)
-    x1, y1, x2, y2 = bbox
-    cx = (x1 + x2) / 2 + rng.gauss(0, noise_px * 0.5)
-    cy = (y1 + y2) / 2 + rng.gauss(0, noise_px * 0.3)
-    bw = (x2 - x1) * (1 + rng.gauss(0, 0.05))
-    bh = (y2 - y1) * (1 + rng.gauss(0, 0.08))
-    return [cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2]
+    gauss = rng.gauss
+    sx, sy = noise_px * 0.5, noise_px * 0.3
+    noisy = []
+    for x1, y1, x2, y2 in bboxes:
+        cx = (x1 + x2) / 2 + gauss(0, sx)
+        cy = (y1 + y2) / 2 + gauss(0, sy)
+        bw = (x2 - x1) * (1 + gauss(0, 0.05))
+        bh = (y2 - y1) * (1 + gauss(0, 0.08))
+        noisy.append([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2])
+    return noisy
 
 
 def run_test():
@@ -75,31 +89,39 @@ def run_test():
         print(f"  {cam.camera_id:8s}  pos=({cam.x:.1f}, {cam.y:.1f})  heading={cam.heading_deg:.0f}°  FOV={cam.hfov_deg:.0f}°")
     print()
 
+    # Step 1: compute what bbox each camera would see (ground truth → image),
+    # then add detection noise to all visible bboxes in one batch
+    views = [
+        (person, cam, world_to_bbox(cam, person["x"], person["y"]))
+        for person in TEST_POSITIONS
+        for cam in CAMERAS
+    ]
+    noisy_bboxes = iter(add_bbox_noise(
+        [bbox for _, _, bbox in views if bbox is not None], noise_px=10.0,
+    ))
+
     results = []
     total_errors_clean = []
     total_errors_noisy = []
 
-    for person in TEST_POSITIONS:
+    for i, (person, cam, bbox) in enumerate(views):
         pid = person["id"]
         true_x, true_y = person["x"], person["y"]
         label = person["label"]
 
-        print(f"─── Person {pid} ({label}) at ({true_x:.1f}, {true_y:.1f}) ───")
-
-        for cam in CAMERAS:
-            # Step 1: compute what bbox the camera would see (ground truth → image)
-            bbox = world_to_bbox(cam, true_x, true_y)
-            if bbox is None:
-                print(f"  {cam.camera_id}: outside FOV")
-                continue
+        if i % len(CAMERAS) == 0:
+            print(f"─── Person {pid} ({label}) at ({true_x:.1f}, {true_y:.1f}) ───")
 
+        if bbox is None:
+            print(f"  {cam.camera_id}: outside FOV")
+        else:
             # Step 2a: estimate from clean bbox
             est_clean = estimate_position(cam, bbox)
             err_clean = estimation_error(est_clean, true_x, true_y)
             total_errors_clean.append(err_clean)
 
             # Step 2b: estimate from noisy bbox (simulates real detection)
-            noisy_bbox = add_bbox_noise(bbox, noise_px=10.0, seed=pid * 100 + hash(cam.camera_id))
+            noisy_bbox = next(noisy_bboxes)
             est_noisy = estimate_position(cam, noisy_bbox)
             err_noisy = estimation_error(est_noisy, true_x, true_y)
             total_errors_noisy.append(err_noisy)
@@ -133,7 +155,8 @@ def run_test():
                 "error_clean_m": round(err_clean, 4),
                 "error_noisy_m": round(err_noisy, 4),
             })
-        print()
+        if i % len(CAMERAS) == len(CAMERAS) - 1:
+            print()
 
     # Summary stats
     print("=" * 70)
@@ -141,9 +164,9 @@ def run_test():
     print("=" * 70)
     if total_errors_noisy:
         n = len(total_errors_noisy)
-        avg_c = sum(total_errors_clean) / n
-        avg_n = sum(total_errors_noisy) / n
-        med_n = sorted(total_errors_noisy)[n // 2]
+        avg_c = statistics.fmean(total_errors_clean)
+        avg_n = statistics.fmean(total_errors_noisy)
+        med_n = statistics.median_high(total_errors_noisy)
         mx_n = max(total_errors_noisy)
         good = sum(1 for e in total_errors_noisy if e < 0.5)
         ok = sum(1 for e in total_errors_noisy if 0.5 <= e < 1.5)
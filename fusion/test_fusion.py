@@ -58,5 +58,68 @@ def test_fusion_pipeline():
     return 0
 
 
+def test_same_frame_detections_stay_separate():
+    # Two people ~1 m apart seen by one camera in one frame: both lie within
+    # the match radius of each other but must not fuse into one track.
+    engine = FusionEngine(match_radius_m=3.0, track_ttl_sec=5.0)
+    engine.update_camera_state(
+        CameraState(agent_id="cam_1", position=[0.0, 0.0], heading=0.0, timestamp=0.0)
+    )
+    frame = CameraFrame(camera_id="cam_1", timestamp=0.0)
+    frame.append(1, [250.0, 180.0, 300.0, 300.0], 0.9)
+    frame.append(2, [340.0, 180.0, 390.0, 300.0], 0.9)
+    engine.process_frame(frame)
+    assert len(engine.get_global_tracks()) == 2
+
+    # Next frame: each detection updates its own track, no new tracks
+    frame.timestamp = 0.2
+    engine.process_frame(frame)
+    tracks = engine.get_global_tracks()
+    assert sorted(t.id for t in tracks) == [1, 2]
+    assert all(t.last_seen == 0.2 for t in tracks)
+
+
+def test_camera_frame_columnar_roundtrip():
+    frame = CameraFrame(camera_id="cam_2", timestamp=1.5)
+    frame.append(7, [10.0, 20.0, 60.0, 140.0], 0.8)
+    frame.append(9, [200.0, 30.0, 250.0, 150.0], 0.6)
+    col = frame.to_dict_columnar()
+    assert col["track_ids"] == [7, 9]
+    assert len(col["bboxes"]) == 8
+    assert CameraFrame.from_dict(col).to_dict() == frame.to_dict()
+    assert CameraFrame.from_dict(frame.to_dict()).to_dict_columnar() == col
+
+
+def test_process_frames_merges_across_cameras():
+    # Two cameras looking at the same spot from different sides: one tick
+    # through process_frames must yield the same single track as feeding
+    # the frames one by one.
+    def run(batched):
+        engine = FusionEngine(match_radius_m=3.0, track_ttl_sec=5.0)
+        engine.update_camera_state(
+            CameraState(agent_id="cam_1", position=[0.0, 0.0], heading=0.0, timestamp=0.0)
+        )
+        engine.update_camera_state(
+            CameraState(agent_id="cam_2", position=[15.5, 0.0], heading=180.0, timestamp=0.0)
+        )
+        f1 = CameraFrame(camera_id="cam_1", timestamp=1.0)
+        f1.append(1, [295.0, 180.0, 345.0, 300.0], 0.9)
+        f2 = CameraFrame(camera_id="cam_2", timestamp=1.0)
+        f2.append(7, [295.0, 180.0, 345.0, 300.0], 0.8)
+        if batched:
+            engine.process_frames([f1, f2])
+        else:
+            engine.process_frame(f1)
+            engine.process_frame(f2)
+        return [(t.id, t.position, t.source_cameras) for t in engine.get_global_tracks()]
+
+    tracks = run(batched=True)
+    assert len(tracks) == 1 and tracks[0][2] == ["cam_1", "cam_2"]
+    assert tracks == run(batched=False)
+
+
 if __name__ == "__main__":
+    test_same_frame_detections_stay_separate()
+    test_camera_frame_columnar_roundtrip()
+    test_process_frames_merges_across_cameras()
     sys.exit(test_fusion_pipeline())
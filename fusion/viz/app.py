@@ -11,39 +11,54 @@ Single command:  python -m fusion.viz.app
 
 import sys
 import os
+import collections
+import functools
+import itertools
 import math
+import threading
+import time
+
+import numpy as np
 
 # Ensure repo root on path
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, ROOT)
 
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, Response, request, send_from_directory
 
-from fusion.schemas import CameraState
+from fusion.schemas import CameraState, dumps_json
 from fusion.mock_person1 import get_ground_truth_positions
-from fusion.camera_estimator import CameraConfig, estimate_position, world_to_bbox
+from fusion.camera_estimator import CameraConfig, estimate_position
+from fusion.matching import min_cost_assignment
 from fusion.camera_feed_pipeline import (
     CameraFeedPipeline,
-    simulate_camera_detections,
+    simulate_detection,
     STATIC_CAMERAS,
-    CONE_RANGE,
+    CONE_RANGE_SQ,
     IMAGE_WIDTH,
     IMAGE_HEIGHT,
     HFOV_DEG,
     NUM_PEOPLE,
 )
-from fusion.viz.walls import WALLS, has_los
+from fusion.viz.walls import WALLS, WALLS_ARR, has_los_batch
 
 app = Flask(__name__, static_folder="static", static_url_path="")
 
 # ── Camera layout ─────────────────────────────────────────────
-CAMERA_IDS = ["cam_1", "cam_2", "cam_3"]
+CAMERA_IDS = [cc.camera_id for cc in STATIC_CAMERAS]
 CAMERA_STATES = [
     CameraState(agent_id=cc.camera_id, position=[cc.x, cc.y],
                 heading=cc.heading_deg, timestamp=0.0)
     for cc in STATIC_CAMERAS
 ]
 
+# Static camera positions / headings (radians) as arrays for _cameras_that_see
+CAM_XY = np.array([cs.position for cs in CAMERA_STATES])
+CAM_HEADING = np.array([cs.heading_rad for cs in CAMERA_STATES])
+
+# Fused tracks further than this from every person get no person label
+MAX_MATCH_M = 3.0
+
 NUM_FRAMES = 600   # 20 seconds at 30 fps
 FPS = 30.0
 
@@ -56,25 +71,30 @@ MOBILE_CAM_ID = "cam_mobile"
 
 from fusion.mock_person1 import _precompute_walk, _smooth_positions
 
-_MOBILE_RAW = _precompute_walk(
-    seed=999,
-    start=(8.0, 8.0),
-    num_steps=int(FPS * (NUM_FRAMES / FPS)),
-    dt=1.0 / FPS,
-    speed=1.0,
-    wander=0.5,
-)
-_MOBILE_PATH = _smooth_positions(_MOBILE_RAW, window=11)
+
+@functools.cache
+def _mobile_path():
+    """Smoothed patrol path, built on first use rather than at import."""
+    raw = _precompute_walk(
+        seed=999,
+        start=(8.0, 8.0),
+        num_steps=int(FPS * (NUM_FRAMES / FPS)),
+        dt=1.0 / FPS,
+        speed=1.0,
+        wander=0.5,
+    )
+    return _smooth_positions(raw, window=11)
 
 
 def _mobile_camera_state(frame_idx: int) -> tuple:
-    n = len(_MOBILE_PATH)
+    path = _mobile_path()
+    n = len(path)
     idx = min(frame_idx, n - 1)
-    x, y = _MOBILE_PATH[idx]
+    x, y = path[idx]
     look = min(idx + 3, n - 1)
     if look > idx:
-        dx = _MOBILE_PATH[look][0] - x
-        dy = _MOBILE_PATH[look][1] - y
+        dx = path[look][0] - x
+        dy = path[look][1] - y
         heading_deg = math.degrees(math.atan2(dy, dx)) % 360
     else:
         heading_deg = 0.0
@@ -84,105 +104,113 @@ def _mobile_camera_state(frame_idx: int) -> tuple:
 ALL_CAMERA_IDS = CAMERA_IDS + [MOBILE_CAM_ID]
 
 
+def _precompute_all_gt(num_frames: int, fps: float, num_people: int) -> list:
+    """Ground truth for every frame (one get_ground_truth_positions list per frame)."""
+    dt = 1.0 / fps
+    return [get_ground_truth_positions(fi * dt, num_people) for fi in range(num_frames)]
+
+
 # ── Helpers ───────────────────────────────────────────────────
 
-def _cameras_that_see(position, camera_states, walls):
-    """Return list of camera IDs that have LOS + FOV + range."""
+def _cameras_that_see(positions, cam_xy, cam_heading, cam_ids, walls):
+    """
+    For each position, list the camera IDs that have LOS + FOV + range.
+
+    positions: (N, 2). cam_xy: (C, 2), or (N, C, 2) for per-position camera
+    poses; cam_heading: radians, (C,) or (N, C). Range and FOV are tested
+    for all pairs at once; LOS is only checked for the pairs that pass.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    d = positions[:, None, :] - cam_xy
+    dist2 = (d * d).sum(-1)
+    ang = np.arctan2(d[..., 1], d[..., 0])
+    diff = np.mod(ang - cam_heading + np.pi, 2 * np.pi) - np.pi
     half_fov = math.radians(HFOV_DEG / 2.0)
-    out = []
-    for cs in camera_states:
-        cam_pos = (cs.position[0], cs.position[1])
-        dx = position[0] - cam_pos[0]
-        dy = position[1] - cam_pos[1]
-        dist = math.sqrt(dx * dx + dy * dy)
-        if dist < 1e-6:
-            out.append(cs.agent_id); continue
-        if dist > CONE_RANGE:
-            continue
-        angle_to_target = math.atan2(dy, dx)
-        heading_rad = math.radians(cs.heading)
-        diff = angle_to_target - heading_rad
-        diff = (diff + math.pi) % (2 * math.pi) - math.pi
-        if abs(diff) > half_fov:
-            continue
-        if not has_los(cam_pos, (position[0], position[1]), walls):
-            continue
-        out.append(cs.agent_id)
-    return out
+    at_cam = dist2 < 1e-12
+    in_view = (dist2 <= CONE_RANGE_SQ) & (np.abs(diff) <= half_fov)
+
+    ii, jj = np.nonzero(in_view & ~at_cam)
+    cams = np.broadcast_to(cam_xy, d.shape)
+    los = np.array(has_los_batch(cams[ii, jj], positions[ii], walls), dtype=bool)
+    visible = at_cam
+    visible[ii[los], jj[los]] = True
+    return [
+        [cid for cid, v in zip(cam_ids, row) if v]
+        for row in visible.tolist()
+    ]
 
 
-def _build_camera_feeds(ground_truth, camera_configs, walls):
+def _build_camera_feeds(ground_truth, camera_configs, seen_by_frame):
     """
-    For each camera, compute bboxes it would see + run estimator.
-    Returns dict: camera_id -> { image_width, image_height, detections: [...] }
+    For each camera, simulate the bboxes it would see + run estimator.
+    seen_by_frame[i] lists the cameras with range + FOV + LOS to
+    ground_truth[i] (from _cameras_that_see), so only those pairs are
+    simulated. Returns (feeds, detections_by_cam):
+      feeds: camera_id -> { image_width, image_height, person_ids, ... }
+        with one list per detection field (detection i is index i of each;
+        bboxes / estimated_position are flat, 4 / 2 values per detection),
+        present only when the camera detects someone. The true position is
+        not repeated: join person_ids on the timestep's "persons".
+      detections_by_cam: camera_id -> raw detections for the pipeline
     """
     feeds = {}
+    detections_by_cam = {}
     for cc in camera_configs:
-        detections = []
-        cam_pos = (cc.x, cc.y)
-        for gt in ground_truth:
-            pid = gt["id"]
-            pos = gt["position"]
-            dx = pos[0] - cc.x
-            dy = pos[1] - cc.y
-            dist = math.sqrt(dx * dx + dy * dy)
-            if dist > CONE_RANGE:
-                continue
-            if not has_los(cam_pos, (pos[0], pos[1]), walls):
-                continue
-            bbox = world_to_bbox(cc, pos[0], pos[1])
-            if bbox is None:
-                continue
-            bbox = [
-                max(0, min(cc.image_width, bbox[0])),
-                max(0, min(cc.image_height, bbox[1])),
-                max(0, min(cc.image_width, bbox[2])),
-                max(0, min(cc.image_height, bbox[3])),
-            ]
-            est = estimate_position(cc, bbox)
-            detections.append({
-                "person_id": pid,
-                "bbox": [round(b, 1) for b in bbox],
-                "estimated_distance": round(est.distance_m, 2),
-                "estimated_position": [round(est.world_x, 2), round(est.world_y, 2)],
-                "actual_position": [round(pos[0], 2), round(pos[1], 2)],
-                "bearing_deg": round(est.bearing_deg, 1),
-                "angle_in_fov_deg": round(est.angle_in_fov_deg, 1),
-                "uncertainty_m": round(est.uncertainty_m, 2),
-                "error_m": round(
-                    math.sqrt((est.world_x - pos[0])**2 + (est.world_y - pos[1])**2), 3
-                ),
-            })
-        feeds[cc.camera_id] = {
+        cid = cc.camera_id
+        dets = []
+        positions = []
+        for gt, seen_by in zip(ground_truth, seen_by_frame):
+            if cid in seen_by:
+                det = simulate_detection(cc, gt["id"], gt["position"])
+                if det is not None:
+                    dets.append(det)
+                    positions.append(gt["position"])
+        detections_by_cam[cid] = dets
+        feed = {
             "image_width": cc.image_width,
             "image_height": cc.image_height,
-            "detections": detections,
         }
-    return feeds
+        feeds[cid] = feed
+        if not dets:
+            continue
+        feed.update(
+            person_ids=[], bboxes=[], estimated_distance=[], estimated_position=[],
+            bearing_deg=[], angle_in_fov_deg=[], uncertainty_m=[], error_m=[],
+        )
+        for det, pos in zip(dets, positions):
+            est = estimate_position(cc, det["bbox"])
+            feed["person_ids"].append(det["track_id"])
+            feed["bboxes"].extend(round(b, 1) for b in det["bbox"])
+            feed["estimated_distance"].append(round(est.distance_m, 2))
+            feed["estimated_position"].extend((round(est.world_x, 2), round(est.world_y, 2)))
+            feed["bearing_deg"].append(round(est.bearing_deg, 1))
+            feed["angle_in_fov_deg"].append(round(est.angle_in_fov_deg, 1))
+            feed["uncertainty_m"].append(round(est.uncertainty_m, 2))
+            feed["error_m"].append(
+                round(math.hypot(est.world_x - pos[0], est.world_y - pos[1]), 3)
+            )
+    return feeds, detections_by_cam
 
 
 def _match_to_persons(fused_tracks_raw, ground_truth):
-    """Greedy match each fused track to the nearest ground-truth person."""
-    gt_positions = {p["id"]: p["position"] for p in ground_truth}
-    used_pids = set()
+    """
+    Optimal one-to-one match of fused tracks to ground-truth persons
+    (Hungarian on the pairwise distance matrix). Tracks further than
+    MAX_MATCH_M from every free person are left unmatched.
+    """
+    matched = {}
+    if fused_tracks_raw and ground_truth:
+        tracks_xy = np.array([ft["position"] for ft in fused_tracks_raw], dtype=float)
+        gt_xy = np.array([p["position"] for p in ground_truth], dtype=float)
+        d = tracks_xy[:, None, :] - gt_xy[None, :, :]
+        dist = np.hypot(d[..., 0], d[..., 1]).tolist()
+        for ti, gi in min_cost_assignment(dist, max_cost=MAX_MATCH_M):
+            matched[ti] = (ground_truth[gi]["id"], dist[ti][gi])
     fused_tracks = []
-    for ft in sorted(fused_tracks_raw, key=lambda f: min(
-        (math.sqrt((f["position"][0] - gp[0])**2 + (f["position"][1] - gp[1])**2)
-         for gp in gt_positions.values()), default=999,
-    )):
-        best_pid = None
-        best_dist = float("inf")
-        for pid, gp in gt_positions.items():
-            if pid in used_pids:
-                continue
-            d = math.sqrt((ft["position"][0] - gp[0])**2 + (ft["position"][1] - gp[1])**2)
-            if d < best_dist:
-                best_dist = d
-                best_pid = pid
-        ft["matched_person"] = best_pid
-        ft["match_error"] = round(best_dist, 3) if best_pid else None
-        if best_pid is not None:
-            used_pids.add(best_pid)
+    for ti, ft in enumerate(fused_tracks_raw):
+        pid, err = matched.get(ti, (None, None))
+        ft["matched_person"] = pid
+        ft["match_error"] = round(err, 3) if pid is not None else None
         fused_tracks.append(ft)
     fused_tracks.sort(key=lambda f: f.get("matched_person") or 999)
     return fused_tracks
@@ -192,51 +220,50 @@ def _match_to_persons(fused_tracks_raw, ground_truth):
 #  Main data builder — runs CameraFeedPipeline automatically
 # ══════════════════════════════════════════════════════════════
 
-def get_fusion_data():
+class _TimestepBuilder:
     """
-    Build all timestep data.  Runs the CameraFeedPipeline on simulated
-    camera feeds and includes both ground truth and pipeline output so
-    the frontend can overlay them for validation.
+    Simulation state carried from frame to frame: the CameraFeedPipeline
+    plus the ground-truth last-seen layer. build() turns one frame's
+    inputs into the timestep dict served to the frontend.
     """
-    dt = 1.0 / FPS
 
-    # ── Instantiate the pipeline (single source of truth) ──
-    pipeline = CameraFeedPipeline(
-        match_radius_m=3.0,
-        track_ttl_sec=3.0,
-        last_seen_ttl_sec=30.0,
-    )
-
-    # Ground-truth last-seen state (for the GT layer only)
-    last_seen_pos = {}
-    last_seen_time = {}
-
-    timesteps = []
-    for fi in range(NUM_FRAMES):
-        t = fi * dt
-
-        # --- Mobile camera ---
-        mx, my, mh = _mobile_camera_state(fi)
-        mobile_cs = CameraState(
-            agent_id=MOBILE_CAM_ID, position=[mx, my],
-            heading=mh, timestamp=t,
+    def __init__(self):
+        # ── Instantiate the pipeline (single source of truth) ──
+        self.pipeline = CameraFeedPipeline(
+            match_radius_m=3.0,
+            track_ttl_sec=3.0,
+            last_seen_ttl_sec=30.0,
         )
-        mobile_cc = CameraConfig(
-            camera_id=MOBILE_CAM_ID, x=mx, y=my,
-            heading_deg=mh, hfov_deg=HFOV_DEG,
+        # Ground-truth last-seen state (for the GT layer only)
+        self.last_seen_pos = {}
+        self.last_seen_time = {}
+        # The mobile camera's config is updated in place every frame; the
+        # pipeline copies what it needs, so nothing holds on to old poses.
+        self.mobile_cc = CameraConfig(
+            camera_id=MOBILE_CAM_ID, x=0.0, y=0.0,
+            heading_deg=0.0, hfov_deg=HFOV_DEG,
             image_width=IMAGE_WIDTH, image_height=IMAGE_HEIGHT,
         )
+        self.all_configs = CAMERA_CONFIGS + [self.mobile_cc]
 
-        all_states = CAMERA_STATES + [mobile_cs]
-        all_configs = CAMERA_CONFIGS + [mobile_cc]
+    def build(self, fi, ground_truth, mobile_state, seen_by_frame):
+        t = fi * (1.0 / FPS)
+        mx, my, mh = mobile_state
+
+        # --- Mobile camera ---
+        mobile_cc = self.mobile_cc
+        mobile_cc.x = mx
+        mobile_cc.y = my
+        mobile_cc.heading_deg = mh
+        all_configs = self.all_configs
 
         # --- Hidden ground truth (for GT layer + camera simulation) ---
-        ground_truth = get_ground_truth_positions(t, NUM_PEOPLE)
+        last_seen_pos = self.last_seen_pos
+        last_seen_time = self.last_seen_time
         persons = []
-        for gt in ground_truth:
+        for gt, seen_by in zip(ground_truth, seen_by_frame):
             pid = gt["id"]
             pos = gt["position"]
-            seen_by = _cameras_that_see(pos, all_states, WALLS)
             visible = len(seen_by) > 0
             if visible:
                 last_seen_pos[pid] = list(pos)
@@ -251,15 +278,17 @@ def get_fusion_data():
             })
 
         # --- Camera feeds (used by both viz + pipeline) ---
-        camera_feeds = _build_camera_feeds(ground_truth, all_configs, WALLS)
+        camera_feeds, detections_by_cam = _build_camera_feeds(
+            ground_truth, all_configs, seen_by_frame,
+        )
 
-        # ── Feed every camera into the pipeline ──
-        for cc in all_configs:
-            dets = simulate_camera_detections(cc, ground_truth, WALLS)
-            pipeline.process_camera_frame(cc, dets, t)
+        # ── Feed every camera into the pipeline (one call per tick) ──
+        self.pipeline.process_frame_multi(
+            [(cc, detections_by_cam[cc.camera_id]) for cc in all_configs], t,
+        )
 
         # ── Read pipeline output ──
-        tracked = pipeline.get_tracked_persons(t)
+        tracked = self.pipeline.get_tracked_persons(t)
         fused_tracks_raw = []
         for tp in tracked:
             fused_tracks_raw.append({
@@ -282,17 +311,65 @@ def get_fusion_data():
             }
         }
 
-        timesteps.append({
+        return {
             "t": t,
             "persons": persons,
             "fused_tracks": fused_tracks,
             "camera_feeds": camera_feeds,
             "camera_positions": camera_positions,
-        })
+        }
 
-    # Camera payload
+
+def get_fusion_data():
+    """
+    Build all timestep data.  Runs the CameraFeedPipeline on simulated
+    camera feeds and includes both ground truth and pipeline output so
+    the frontend can overlay them for validation.
+    """
+    builder = _TimestepBuilder()
+
+    # ── Per-frame inputs, computed up front ──
+    gt_all = _precompute_all_gt(NUM_FRAMES, FPS, NUM_PEOPLE)
+    mobile_all = np.array([_mobile_camera_state(fi) for fi in range(NUM_FRAMES)])
+    gt_xy = np.array([[gt["position"] for gt in frame] for frame in gt_all], dtype=float)
+
+    # Visibility for every (frame, person, camera) in one batch; the mobile
+    # camera is the last column of the per-frame camera arrays.
+    cam_xy = np.empty((NUM_FRAMES, len(ALL_CAMERA_IDS), 2))
+    cam_xy[:, :-1] = CAM_XY
+    cam_xy[:, -1] = mobile_all[:, :2]
+    cam_heading = np.empty((NUM_FRAMES, len(ALL_CAMERA_IDS)))
+    cam_heading[:, :-1] = CAM_HEADING
+    cam_heading[:, -1] = np.radians(mobile_all[:, 2])
+    seen_by_all = _cameras_that_see(
+        gt_xy.reshape(-1, 2),
+        np.repeat(cam_xy, NUM_PEOPLE, axis=0),
+        np.repeat(cam_heading, NUM_PEOPLE, axis=0),
+        ALL_CAMERA_IDS, WALLS_ARR,
+    )
+
+    timesteps = [
+        builder.build(
+            fi, ground_truth, mobile_state,
+            seen_by_all[fi * NUM_PEOPLE:(fi + 1) * NUM_PEOPLE],
+        )
+        for fi, (ground_truth, mobile_state)
+        in enumerate(zip(gt_all, mobile_all.tolist()))
+    ]
+
+    return {
+        "cameras": _cameras_payload(),
+        "walls": WALLS,
+        "timesteps": timesteps,
+        # When the payload was built; /api/map serves it cached, so this is
+        # not the time of the response
+        "built_at": time.time(),
+    }
+
+
+def _cameras_payload():
     mx0, my0, mh0 = _mobile_camera_state(0)
-    cameras_payload = [
+    return [
         {
             "id": cc.camera_id,
             "position": [cc.x, cc.y],
@@ -314,12 +391,79 @@ def get_fusion_data():
             "mobile": True,
         }
     ]
-    return {
-        "cameras": cameras_payload,
-        "walls": WALLS,
-        "timesteps": timesteps,
-        "timestamp": __import__("time").time(),
-    }
+
+
+# ══════════════════════════════════════════════════════════════
+#  Live mode — the same simulation stepped in real time
+# ══════════════════════════════════════════════════════════════
+
+# The live run's most recent timesteps (frames next_fi - len .. next_fi - 1);
+# older frames are dropped so an hour-long session stays bounded.
+LIVE_WINDOW_FRAMES = NUM_FRAMES
+_LIVE_LOCK = threading.Lock()
+_LIVE_TIMESTEPS = collections.deque(maxlen=LIVE_WINDOW_FRAMES)
+_LIVE_NEXT_FI = 0
+_LIVE_THREAD = None
+
+
+def _live_loop():
+    """
+    Step the simulation one frame per 1/FPS, appending each timestep. The
+    NUM_FRAMES simulation is replayed on a loop, so frame fi shows frame
+    fi % NUM_FRAMES while t keeps counting up.
+    """
+    global _LIVE_NEXT_FI
+    builder = _TimestepBuilder()
+    dt = 1.0 / FPS
+    start = time.monotonic()
+    first_fi = fi = _LIVE_NEXT_FI
+    while True:
+        sim_fi = fi % NUM_FRAMES
+        ground_truth = get_ground_truth_positions(sim_fi * dt, NUM_PEOPLE)
+        mobile_state = _mobile_camera_state(sim_fi)
+        mx, my, mh = mobile_state
+        seen_by_frame = _cameras_that_see(
+            [gt["position"] for gt in ground_truth],
+            np.vstack((CAM_XY, [[mx, my]])),
+            np.append(CAM_HEADING, math.radians(mh)),
+            ALL_CAMERA_IDS, WALLS_ARR,
+        )
+        timestep = builder.build(fi, ground_truth, mobile_state, seen_by_frame)
+        fi += 1
+        with _LIVE_LOCK:
+            _LIVE_TIMESTEPS.append(timestep)
+            _LIVE_NEXT_FI = fi
+        delay = start + (fi - first_fi) * dt - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _ensure_live_run():
+    """Start the live run, or restart it if its thread has died."""
+    global _LIVE_THREAD
+    with _LIVE_LOCK:
+        if _LIVE_THREAD is None or not _LIVE_THREAD.is_alive():
+            _LIVE_THREAD = threading.Thread(target=_live_loop, daemon=True)
+            _LIVE_THREAD.start()
+
+
+# Serialized /api/map payload. The simulation is deterministic, so it is
+# built on the first request and reused; /api/map?nocache=1 rebuilds it.
+_CACHED_JSON = None
+
+
+def get_fusion_json(nocache: bool = False) -> bytes:
+    """get_fusion_data() serialized to JSON bytes, cached across requests."""
+    global _CACHED_JSON
+    if _CACHED_JSON is None or nocache:
+        _CACHED_JSON = dumps_json(get_fusion_data())
+    return _CACHED_JSON
+
+
+def map_response() -> Response:
+    """/api/map response for the current request (shared with cam_view)."""
+    nocache = request.args.get("nocache", "").lower() in ("1", "true", "yes")
+    return Response(get_fusion_json(nocache), mimetype="application/json")
 
 
 # ── Routes ────────────────────────────────────────────────────
@@ -331,7 +475,32 @@ def index():
 
 @app.route("/api/map")
 def api_map():
-    return jsonify(get_fusion_data())
+    return map_response()
+
+
+@app.route("/api/map/delta")
+def api_map_delta():
+    """
+    Timesteps of the live run from frame since_fi on; the first request
+    starts it, and it runs until the server stops. Poll with
+    since_fi=<next_fi of the previous response>. Only the last
+    LIVE_WINDOW_FRAMES frames are kept, so a since_fi older than that
+    starts at first_fi instead.
+    """
+    _ensure_live_run()
+    since_fi = max(0, request.args.get("since_fi", 0, type=int))
+    with _LIVE_LOCK:
+        next_fi = _LIVE_NEXT_FI
+        first_fi = next_fi - len(_LIVE_TIMESTEPS)
+        start = min(max(since_fi, first_fi), next_fi)
+        new_steps = list(itertools.islice(_LIVE_TIMESTEPS, start - first_fi, None))
+    payload = {
+        "since_fi": start,
+        "first_fi": first_fi,
+        "next_fi": next_fi,
+        "timesteps": new_steps,
+    }
+    return Response(dumps_json(payload), mimetype="application/json")
 
 
 def main():
@@ -0,0 +1,36 @@
+// Shared /api/map payload decoding for the viz and cam_view pages
+// (cam_view serves this same file from the viz static folder).
+(function () {
+  "use strict";
+
+  // camera_feeds arrive column-wise (one array per field, bboxes and
+  // estimated_position flattened); rebuild the per-detection objects the
+  // drawing code uses, taking actual_position from the matching person.
+  function expandFeeds(d) {
+    (d.timesteps || []).forEach(function (ts) {
+      var posById = {};
+      (ts.persons || []).forEach(function (p) { posById[p.id] = p.position; });
+      var feeds = ts.camera_feeds || {};
+      Object.keys(feeds).forEach(function (cid) {
+        var f = feeds[cid];
+        if (f.detections) return;
+        f.detections = (f.person_ids || []).map(function (pid, i) {
+          return {
+            person_id: pid,
+            bbox: f.bboxes.slice(4 * i, 4 * i + 4),
+            estimated_distance: f.estimated_distance[i],
+            estimated_position: f.estimated_position.slice(2 * i, 2 * i + 2),
+            actual_position: posById[pid],
+            bearing_deg: f.bearing_deg[i],
+            angle_in_fov_deg: f.angle_in_fov_deg[i],
+            uncertainty_m: f.uncertainty_m[i],
+            error_m: f.error_m[i],
+          };
+        });
+      });
+    });
+    return d;
+  }
+
+  window.expandFeeds = expandFeeds;
+})();
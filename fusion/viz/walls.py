@@ -3,7 +3,18 @@ Walls as line segments in world coordinates.
 Used for line-of-sight: a camera cannot see a point if the segment intersects a wall.
 """
 
-from typing import List, Tuple
+from array import array
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: has_los_batch falls back to the scalar core
+    np = None
+
+try:
+    import numba
+except ImportError:  # optional: the pure-Python LOS core below is used as-is
+    numba = None
 
 # Each wall is [[x1, y1], [x2, y2]] in meters. Room: x in [0, 12], y in [0, 10].
 # These walls create corners and corridors so some cameras can't see all points.
@@ -42,17 +53,143 @@ def segment_intersect(
     return False
 
 
+# Below this many pairs the scalar core beats numpy's per-call overhead.
+_MIN_VECTOR_PAIRS = 32
+
+
+def _flatten_walls(walls: List[List[List[float]]]) -> array:
+    """
+    Walls as a flat buffer for _has_los_core, _WALL_STRIDE values per wall:
+    x1, y1, x2, y2, then the wall's bounding box min_x, max_x, min_y, max_y.
+    """
+    out = array("d")
+    for (x1, y1), (x2, y2) in walls:
+        out.extend((x1, y1, x2, y2, min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2)))
+    return out
+
+
+_WALL_STRIDE = 8
+
+
+def _has_los_core(ox, oy, tx, ty, walls_flat):
+    """segment_intersect against every wall, inlined as scalar expressions."""
+    # A strict crossing lies inside both bounding boxes, so walls whose box
+    # misses the segment's box are skipped before any cross product.
+    sx0, sx1 = (ox, tx) if ox <= tx else (tx, ox)
+    sy0, sy1 = (oy, ty) if oy <= ty else (ty, oy)
+    for k in range(0, len(walls_flat), _WALL_STRIDE):
+        if (sx1 < walls_flat[k + 4] or sx0 > walls_flat[k + 5]
+                or sy1 < walls_flat[k + 6] or sy0 > walls_flat[k + 7]):
+            continue
+        x1 = walls_flat[k]
+        y1 = walls_flat[k + 1]
+        x2 = walls_flat[k + 2]
+        y2 = walls_flat[k + 3]
+        d1 = (tx - ox) * (y1 - oy) - (ty - oy) * (x1 - ox)
+        d2 = (tx - ox) * (y2 - oy) - (ty - oy) * (x2 - ox)
+        if d1 * d2 < 0:
+            d3 = (x2 - x1) * (oy - y1) - (y2 - y1) * (ox - x1)
+            d4 = (x2 - x1) * (ty - y1) - (y2 - y1) * (tx - x1)
+            if d3 * d4 < 0:
+                return False
+    return True
+
+
+def _walls_flat(walls):
+    # WALLS / WALLS_ARR are treated as constant; anything else (a nested
+    # list, or an (N, 4) array of x1, y1, x2, y2) is flattened per call.
+    if walls is WALLS or walls is WALLS_ARR:
+        return _WALLS_FLAT
+    if np is not None and isinstance(walls, np.ndarray):
+        walls = walls.reshape(-1, 2, 2).tolist()
+    return _flatten_walls(walls)
+
+
 def has_los(
     origin: Tuple[float, float],
     target: Tuple[float, float],
     walls: List[List[List[float]]],
 ) -> bool:
     """True if the line from origin to target does not cross any wall."""
-    o = (float(origin[0]), float(origin[1]))
-    t = (float(target[0]), float(target[1]))
-    for wall in walls:
-        c = (wall[0][0], wall[0][1])
-        d = (wall[1][0], wall[1][1])
-        if segment_intersect(o, t, c, d):
-            return False
-    return True
+    return bool(_has_los_core(
+        float(origin[0]), float(origin[1]),
+        float(target[0]), float(target[1]),
+        _walls_flat(walls),
+    ))
+
+
+def has_los_batch(
+    origins: Sequence[Tuple[float, float]],
+    targets: Sequence[Tuple[float, float]],
+    walls: List[List[List[float]]],
+) -> List[bool]:
+    """has_los for each (origins[i], targets[i]) pair."""
+    walls_flat = _walls_flat(walls)
+    if numba is not None:
+        return _has_los_batch_nb(
+            np.asarray(origins, dtype=np.float64).reshape(-1, 2),
+            np.asarray(targets, dtype=np.float64).reshape(-1, 2),
+            walls_flat,
+        ).tolist()
+    if np is not None and len(origins) >= _MIN_VECTOR_PAIRS:
+        return has_los_any(origins, targets, _walls_arr(walls_flat)).tolist()
+    if hasattr(origins, "tolist"):
+        origins = origins.tolist()
+    if hasattr(targets, "tolist"):
+        targets = targets.tolist()
+    return [
+        _has_los_core(float(o[0]), float(o[1]), float(t[0]), float(t[1]), walls_flat)
+        for o, t in zip(origins, targets)
+    ]
+
+
+def has_los_any(o_xy, t_xy, walls_arr):
+    """
+    Vectorized has_los: o_xy / t_xy are (..., 2) arrays of segment endpoints,
+    walls_arr is (N, 4) rows of x1, y1, x2, y2. All segments are tested
+    against all walls in one branch-free pass; returns a bool array of
+    shape (...), True where the segment crosses no wall. Requires numpy.
+    """
+    o = np.asarray(o_xy, dtype=np.float64)[..., None, :]
+    t = np.asarray(t_xy, dtype=np.float64)[..., None, :]
+    ox, oy = o[..., 0], o[..., 1]
+    tx, ty = t[..., 0], t[..., 1]
+    x1, y1, x2, y2 = walls_arr[:, 0], walls_arr[:, 1], walls_arr[:, 2], walls_arr[:, 3]
+    d1 = (tx - ox) * (y1 - oy) - (ty - oy) * (x1 - ox)
+    d2 = (tx - ox) * (y2 - oy) - (ty - oy) * (x2 - ox)
+    d3 = (x2 - x1) * (oy - y1) - (y2 - y1) * (ox - x1)
+    d4 = (x2 - x1) * (ty - y1) - (y2 - y1) * (tx - x1)
+    return ~np.any((d1 * d2 < 0) & (d3 * d4 < 0), axis=-1)
+
+
+def _walls_arr(walls_flat):
+    """(N, 4) x1, y1, x2, y2 view of a flat wall buffer (no copy)."""
+    return np.frombuffer(walls_flat, dtype=np.float64).reshape(-1, _WALL_STRIDE)[:, :4]
+
+
+_WALLS_FLAT = _flatten_walls(WALLS)
+
+# Wall endpoints as a read-only (N, 4) float64 array, built once at import,
+# for vectorized callers (None without numpy). WALLS stays the nested-list
+# form used in JSON payloads.
+WALLS_ARR = None
+if np is not None:
+    WALLS_ARR = _walls_arr(_WALLS_FLAT)
+    WALLS_ARR.flags.writeable = False
+
+# JIT the LOS core when numba is installed (numba brings numpy with it);
+# warm it up once at import so the first frame does not pay compilation.
+if numba is not None:
+    _has_los_core = numba.njit(cache=True)(_has_los_core)
+
+    @numba.njit(cache=True)
+    def _has_los_batch_nb(origins, targets, walls_flat):
+        out = np.empty(origins.shape[0], dtype=np.bool_)
+        for i in range(origins.shape[0]):
+            out[i] = _has_los_core(
+                origins[i, 0], origins[i, 1], targets[i, 0], targets[i, 1], walls_flat
+            )
+        return out
+
+    _has_los_core(0.0, 0.0, 1.0, 1.0, _WALLS_FLAT)
+    _has_los_batch_nb(np.zeros((1, 2)), np.ones((1, 2)), _WALLS_FLAT)
@@ -4,13 +4,13 @@ Write mock Person 1 output to a JSON file.
 Person 1 (Vision) can replace this file with real API output; Person 2 reads via --person1-json.
 """
 
-import json
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fusion.mock_person1 import generate_frames_finite
+from fusion.schemas import dumps_json
 
 def main():
     camera_ids = ["cam_1", "cam_2", "cam_3"]
@@ -21,8 +21,8 @@ def main():
         fps=5.0,
     )
     out_path = os.path.join(os.path.dirname(__file__), "sample_person1_frames.json")
-    with open(out_path, "w") as f:
-        json.dump(frames, f, indent=2)
+    with open(out_path, "wb") as f:
+        f.write(dumps_json(frames, indent=True))
     print(f"Wrote {len(frames)} frames to {out_path}", file=sys.stderr)
     return 0
 
@@ -14,123 +14,150 @@ Run on Justin's Mac alongside the fusion viz server:
 This replaces the mock data / simulation with real phone data.
 """
 
-import socket
-import json
+import selectors
 import time
 import sys
 import os
-import threading
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
 
-from fusion.schemas import CameraState, CameraFrame, TrackDetection
+from fusion.schemas import CameraState, CameraFrame, loads_json
 from fusion.fusion_engine import FusionEngine
+from receiver_udp import RECV_BUF_SIZE, udp_socket
+
+try:
+    import msgspec
+except ImportError:  # optional: detection packets are parsed with loads_json
+    msgspec = None
 
 # --- Config ---
 POSITION_PORT = 5056       # UDP: receives camera_state from iPhones
 DETECTION_PORT = 5055      # UDP: receives track detections from Logan's Mac
+SO_RCVBUF_BYTES = 1 << 20
+STATUS_INTERVAL_SEC = 3.0
 
+# Only the select loop in main() touches the engine, so it needs no lock.
 engine = FusionEngine(match_radius_m=3.0, track_ttl_sec=5.0)
-engine_lock = threading.Lock()
-
-
-def listen_positions():
-    """Thread: receive camera position/heading from iPhones."""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind(("0.0.0.0", POSITION_PORT))
-    print(f"[Bridge] Listening for phone positions on UDP :{POSITION_PORT}")
-
-    while True:
-        data, addr = sock.recvfrom(65535)
-        try:
-            msg = json.loads(data.decode("utf-8"))
-        except Exception as e:
-            print(f"[Bridge] Bad position packet from {addr}: {e}")
-            continue
-
+_buf = bytearray(RECV_BUF_SIZE)
+_view = memoryview(_buf)
+
+
+if msgspec is not None:
+    class TrackMsg(msgspec.Struct):
+        track_id: int
+        bbox: list[float]
+        confidence: float = 0.5
+
+    class DetectionMsg(msgspec.Struct):
+        type: str
+        camera_id: str = "unknown"
+        timestamp: float | None = None
+        detections: list[TrackMsg] = []
+
+    # Decodes straight into the structs above (type-checked, no dicts)
+    _decode_detection_msg = msgspec.json.Decoder(DetectionMsg).decode
+
+
+def _parse_detections(data):
+    """
+    Parse a detection packet into (camera_id, timestamp, tracks), where
+    tracks yields (track_id, bbox, confidence); None if it is not a
+    "tracks" message.
+    """
+    if msgspec is not None:
+        msg = _decode_detection_msg(data)
+        if msg.type != "tracks":
+            return None
+        tracks = ((t.track_id, t.bbox, t.confidence) for t in msg.detections)
+        timestamp = msg.timestamp
+        return msg.camera_id, timestamp if timestamp is not None else time.time(), tracks
+
+    msg = loads_json(data)
+    if msg.get("type") != "tracks":
+        return None
+    tracks = (
+        (d["track_id"], d["bbox"], d.get("confidence", 0.5))
+        for d in msg.get("detections", [])
+    )
+    return msg.get("camera_id", "unknown"), msg.get("timestamp", time.time()), tracks
+
+
+def process_position(sock):
+    """Handle one camera_state packet from an iPhone."""
+    try:
+        n, addr = sock.recvfrom_into(_buf)
+    except BlockingIOError:  # readiness was spurious; nothing to read
+        return
+    try:
+        msg = loads_json(_view[:n])
         if msg.get("type") != "camera_state":
-            continue
-
+            return
         state = CameraState(
             agent_id=msg["camera_id"],
             position=msg["position"],
             heading=msg["heading"],
             timestamp=msg.get("timestamp", time.time()),
         )
+    except Exception as e:
+        print(f"[Bridge] Bad position packet from {addr}: {e}")
+        return
 
-        with engine_lock:
-            engine.update_camera_state(state)
+    engine.update_camera_state(state)
 
-        print(
-            f"[Bridge] Camera {state.agent_id} → "
-            f"pos=({state.position[0]:.2f}, {state.position[1]:.2f}) "
-            f"heading={state.heading:.1f}°"
-        )
+    print(
+        f"[Bridge] Camera {state.agent_id} → "
+        f"pos=({state.position[0]:.2f}, {state.position[1]:.2f}) "
+        f"heading={state.heading:.1f}°"
+    )
 
 
-def listen_detections():
-    """Thread: receive YOLO detections from Logan's Mac."""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind(("0.0.0.0", DETECTION_PORT))
-    print(f"[Bridge] Listening for detections on UDP :{DETECTION_PORT}")
+def process_detection(sock):
+    """Handle one packet of YOLO detections from Logan's Mac."""
+    try:
+        n, addr = sock.recvfrom_into(_buf)
+    except BlockingIOError:  # readiness was spurious; nothing to read
+        return
+    try:
+        parsed = _parse_detections(_view[:n])
+    except Exception as e:
+        print(f"[Bridge] Bad detection packet from {addr}: {e}")
+        return
 
-    while True:
-        data, addr = sock.recvfrom(65535)
-        try:
-            msg = json.loads(data.decode("utf-8"))
-        except Exception as e:
-            print(f"[Bridge] Bad detection packet from {addr}: {e}")
-            continue
-
-        if msg.get("type") != "tracks":
-            continue
-
-        camera_id = msg.get("camera_id", "unknown")
-        timestamp = msg.get("timestamp", time.time())
-        detections = msg.get("detections", [])
-
-        tracks = [
-            TrackDetection(
-                track_id=d["track_id"],
-                bbox=d["bbox"],
-                confidence=d.get("confidence", 0.5),
-            )
-            for d in detections
-        ]
+    if parsed is None:
+        return
 
-        frame = CameraFrame(
-            camera_id=camera_id,
-            timestamp=timestamp,
-            tracks=tracks,
-        )
+    camera_id, timestamp, tracks = parsed
+    frame = CameraFrame(camera_id=camera_id, timestamp=timestamp)
+    try:
+        for track_id, bbox, confidence in tracks:
+            frame.append(track_id, bbox, confidence)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"[Bridge] Bad detection in packet from {addr}: {e}")
+        return
 
-        with engine_lock:
-            engine.process_frame(frame)
+    engine.process_frame(frame)
 
-        global_tracks = engine.get_global_tracks()
-        print(
-            f"[Bridge] Detections from {camera_id}: {len(tracks)} people → "
-            f"{len(global_tracks)} global tracks"
-        )
+    global_tracks = engine.get_global_tracks()
+    print(
+        f"[Bridge] Detections from {camera_id}: {len(frame)} people → "
+        f"{len(global_tracks)} global tracks"
+    )
 
 
 def print_status():
-    """Thread: periodically print fusion state."""
-    while True:
-        time.sleep(3)
-        with engine_lock:
-            tracks = engine.get_global_tracks()
-        if tracks:
-            print(f"\n[Bridge] === Global Tracks ({len(tracks)}) ===")
-            for t in tracks:
-                print(
-                    f"  Track {t.id:2d}  "
-                    f"pos=({t.position[0]:6.2f}, {t.position[1]:6.2f})  "
-                    f"conf={t.confidence:.2f}  "
-                    f"src={t.source_cameras}"
-                )
-            print()
+    """Print the current fusion state."""
+    tracks = engine.get_global_tracks()
+    if tracks:
+        print(f"\n[Bridge] === Global Tracks ({len(tracks)}) ===")
+        for t in tracks:
+            print(
+                f"  Track {t.id:2d}  "
+                f"pos=({t.position[0]:6.2f}, {t.position[1]:6.2f})  "
+                f"conf={t.confidence:.2f}  "
+                f"src={t.source_cameras}"
+            )
+        print()
 
 
 def main():
@@ -142,20 +169,27 @@ def main():
     print("=" * 60)
     print()
 
-    threads = [
-        threading.Thread(target=listen_positions, daemon=True),
-        threading.Thread(target=listen_detections, daemon=True),
-        threading.Thread(target=print_status, daemon=True),
-    ]
-
-    for t in threads:
-        t.start()
+    # Both UDP sockets are multiplexed on one thread; the status print runs
+    # from the same loop whenever the select timeout for it comes due.
+    sel = selectors.DefaultSelector()
+    sel.register(udp_socket(POSITION_PORT, SO_RCVBUF_BYTES), selectors.EVENT_READ, process_position)
+    print(f"[Bridge] Listening for phone positions on UDP :{POSITION_PORT}")
+    sel.register(udp_socket(DETECTION_PORT, SO_RCVBUF_BYTES), selectors.EVENT_READ, process_detection)
+    print(f"[Bridge] Listening for detections on UDP :{DETECTION_PORT}")
 
+    next_status = time.monotonic() + STATUS_INTERVAL_SEC
     try:
         while True:
-            time.sleep(1)
+            timeout = max(0.0, next_status - time.monotonic())
+            for key, _ in sel.select(timeout):
+                key.data(key.fileobj)
+            if time.monotonic() >= next_status:
+                print_status()
+                next_status = time.monotonic() + STATUS_INTERVAL_SEC
     except KeyboardInterrupt:
         print("\n[Bridge] Shutting down.")
+    finally:
+        sel.close()
 
 
 if __name__ == "__main__":
@@ -10,6 +10,9 @@ Usage:
     pip install flask
     python frame_receiver.py
 
+    # or, with persistent connections (see gunicorn_conf.py):
+    gunicorn -c gunicorn_conf.py frame_receiver:app
+
 The iPhones POST to:
     POST http://<this-mac-ip>:5050/frame
     Headers:
@@ -19,73 +22,316 @@ The iPhones POST to:
     Body: raw JPEG bytes
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_file
+import atexit
+import json
 import os
+import queue
+import struct
 import time
 import threading
 
+from receiver_log import queue_logger
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # optional: frames are only saved as JPEG
+    _turbojpeg = None
+
 app = Flask(__name__)
+# Bodies over the cap are refused with 413 before any of them is read
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_JPEG_BYTES", 2 * 1024 * 1024))
+
+LOG_EVERY_N_FRAMES = 30
+FRAME_BUF_SIZE = 1 << 20  # pooled body buffer; fits any normal JPEG frame
+
+# With PyTurboJPEG installed, each frame is also decoded once here and saved
+# as <camera>_latest.bgr: this header, then height*width*3 BGR bytes (the
+# layout cv2 uses), which consumers can load without decoding the JPEG again.
+# The frame's timestamp and JPEG length identify which JPEG it was decoded
+# from; the file is replaced whole, so it is never read half-written.
+DECODED_HEADER = struct.Struct("<dIII")  # timestamp, jpeg length, width, height
 
-SAVE_DIR = "received_frames"
+log = queue_logger("FrameReceiver")
+
+# Frames are overwritten on every POST and only the newest is ever read, so
+# they never need to survive a crash: no fsync, and by default they live in
+# RAM (tmpfs) rather than on disk. Override with FRAME_SAVE_DIR, e.g. a macOS
+# RAM disk (see README).
+SAVE_DIR = os.environ.get(
+    "FRAME_SAVE_DIR",
+    "/dev/shm/frame_receiver" if os.path.isdir("/dev/shm") else "received_frames",
+)
 os.makedirs(SAVE_DIR, exist_ok=True)
 
-# Stats per camera
+# Stats per camera. stats_lock only guards adding a camera; each camera's
+# counters have their own lock, so cameras never contend with each other.
 stats = {}
 stats_lock = threading.Lock()
+camera_locks = {}
+
+# One open fd per camera's latest-frame file, reused for every frame
+fd_cache = {}
+fd_lock = threading.Lock()
+
+# Frames go to disk on one writer thread per camera, fed through a short
+# queue; request threads only enqueue, so a slow disk never delays the 200.
+# Only the newest frame matters, so a full queue drops its oldest entry.
+WRITE_QUEUE_DEPTH = 2
+write_queues = {}
+write_queues_lock = threading.Lock()
+
+# Idle FRAME_BUF_SIZE body buffers. A request reads into one, hands it to the
+# camera's writer with the frame, and the writer returns it once written.
+MAX_FREE_BUFS = 16
+_free_bufs = []
+
+
+def _latest_path(camera_id, ext="jpg"):
+    return os.path.join(SAVE_DIR, f"{camera_id}_latest.{ext}")
+
+
+def _latest_fd(camera_id):
+    """
+    Return the cached write fd for camera_id, opening it on first use; the
+    file path is only built then, not on every frame.
+    """
+    fd = fd_cache.get(camera_id)
+    if fd is None:
+        with fd_lock:
+            fd = fd_cache.get(camera_id)
+            if fd is None:
+                fd = os.open(_latest_path(camera_id), os.O_WRONLY | os.O_CREAT, 0o644)
+                fd_cache[camera_id] = fd
+    return fd
+
+
+def _take_buf():
+    try:
+        return _free_bufs.pop()
+    except IndexError:
+        return bytearray(FRAME_BUF_SIZE)
+
+
+def _give_buf(buf):
+    # Buffers grown for an oversized frame are left to the GC
+    if len(buf) == FRAME_BUF_SIZE and len(_free_bufs) < MAX_FREE_BUFS:
+        _free_bufs.append(buf)
+
+
+def _read_body():
+    """
+    Read the request body into a pooled buffer and return (buf, n); the
+    caller owns buf until it is given back. The buffer doubles as needed
+    for an oversized frame.
+    """
+    buf = _take_buf()
+    stream = request.stream
+    # With MAX_CONTENT_LENGTH set this is Werkzeug's LimitedStream, which has
+    # readinto(); read() covers any input stream without it
+    readinto = getattr(stream, "readinto", None)
+    n = 0
+    while True:
+        if n == len(buf):
+            grown = bytearray(2 * len(buf))
+            grown[:n] = buf
+            _give_buf(buf)
+            buf = grown
+        if readinto is not None:
+            got = readinto(memoryview(buf)[n:])
+        else:
+            chunk = stream.read(len(buf) - n)
+            got = len(chunk)
+            buf[n:n + got] = chunk
+        if not got:
+            return buf, n
+        n += got
+
+
+def _write_frames(camera_id, frames):
+    """Writer thread: overwrite camera_id's latest-frame file with each frame."""
+    while True:
+        buf, n, timestamp = frames.get()
+        try:
+            _write_frame(camera_id, memoryview(buf)[:n], timestamp)
+        except Exception as e:
+            # Keep the thread alive: the next frame may well write fine
+            log.warning(f"[{camera_id}] frame write failed: {e!r}")
+        finally:
+            _give_buf(buf)
+
+
+def _write_frame(camera_id, jpeg, timestamp):
+    # Decoded copy first, so it is in place when the JPEG it matches is.
+    # A frame that fails to decode is still saved as JPEG.
+    if _turbojpeg is not None:
+        try:
+            _write_decoded(camera_id, jpeg, timestamp)
+        except Exception as e:
+            log.warning(f"[{camera_id}] frame decode failed: {e!r}")
+    # Overwrite in place: rewriting the same pages means a camera never has
+    # more than one frame's worth of dirty page cache, so writeback cannot
+    # build up behind the writer. Those pages hold the frame the consumer
+    # reads next, so they are deliberately left cached (no
+    # POSIX_FADV_DONTNEED / F_NOCACHE).
+    fd = _latest_fd(camera_id)
+    os.pwrite(fd, jpeg, 0)
+    os.ftruncate(fd, len(jpeg))
+
+
+def _write_decoded(camera_id, jpeg, timestamp):
+    """Decode a JPEG with libjpeg-turbo and replace camera_id's .bgr file with it."""
+    frame = _turbojpeg.decode(jpeg, pixel_format=TJPF_BGR)  # (h, w, 3) uint8
+    height, width = frame.shape[:2]
+    path = _latest_path(camera_id, "bgr")
+    tmp_path = path + ".tmp"  # only this camera's writer thread uses it
+    with open(tmp_path, "wb") as f:
+        f.write(DECODED_HEADER.pack(timestamp, len(jpeg), width, height))
+        f.write(frame)
+    os.replace(tmp_path, path)
+
+
+def _write_queue(camera_id):
+    """Return camera_id's frame queue, starting its writer thread on first use."""
+    frames = write_queues.get(camera_id)
+    if frames is None:
+        with write_queues_lock:
+            frames = write_queues.get(camera_id)
+            if frames is None:
+                frames = queue.Queue(maxsize=WRITE_QUEUE_DEPTH)
+                threading.Thread(
+                    target=_write_frames, args=(camera_id, frames),
+                    name=f"writer-{camera_id}", daemon=True,
+                ).start()
+                write_queues[camera_id] = frames
+    return frames
+
+
+def _enqueue_frame(frames, buf, n, timestamp):
+    """Queue a frame for writing, dropping the oldest queued one if full."""
+    while True:
+        try:
+            frames.put_nowait((buf, n, timestamp))
+            return
+        except queue.Full:
+            try:
+                stale = frames.get_nowait()[0]
+            except queue.Empty:
+                continue
+            _give_buf(stale)
+
+
+@atexit.register
+def _close_fds():
+    with fd_lock:
+        for fd in fd_cache.values():
+            os.close(fd)
+        fd_cache.clear()
 
 
 @app.route("/frame", methods=["POST"])
 def receive_frame():
     camera_id = request.headers.get("X-Camera-Id", "unknown")
-    timestamp = request.headers.get("X-Timestamp", str(time.time()))
+    timestamp = request.headers.get("X-Timestamp")
+    if timestamp is None:
+        timestamp = str(time.time())
+    last_seen = float(timestamp)
 
-    jpeg_data = request.data
-    if not jpeg_data:
-        return jsonify({"error": "no data"}), 400
+    if request.content_length is None:
+        return jsonify({"error": "Content-Length required"}), 411
 
-    # Save latest frame (overwrite) for each camera
-    filepath = os.path.join(SAVE_DIR, f"{camera_id}_latest.jpg")
-    with open(filepath, "wb") as f:
-        f.write(jpeg_data)
+    buf, n = _read_body()
+    if not n:
+        _give_buf(buf)
+        return jsonify({"error": "no data"}), 400
 
     # Also keep a numbered copy for debugging (optional, comment out to save disk)
     # with stats_lock:
     #     count = stats.get(camera_id, {}).get("frames", 0)
     #     numbered = os.path.join(SAVE_DIR, f"{camera_id}_{count:06d}.jpg")
     #     with open(numbered, "wb") as f:
-    #         f.write(jpeg_data)
+    #         f.write(memoryview(buf)[:n])
 
-    with stats_lock:
-        if camera_id not in stats:
-            stats[camera_id] = {"frames": 0, "bytes": 0, "first_seen": time.time()}
-        stats[camera_id]["frames"] += 1
-        stats[camera_id]["bytes"] += len(jpeg_data)
-        stats[camera_id]["last_seen"] = float(timestamp)
-        count = stats[camera_id]["frames"]
-
-    print(
-        f"[{camera_id}] frame #{count:5d}  "
-        f"{len(jpeg_data):6d} bytes  "
-        f"ts={timestamp}"
-    )
+    # Save latest frame (overwrite) for each camera, on its writer thread
+    _enqueue_frame(_write_queue(camera_id), buf, n, last_seen)
+
+    lock = camera_locks.get(camera_id)
+    if lock is None:
+        with stats_lock:
+            if camera_id not in stats:
+                stats[camera_id] = {"frames": 0, "bytes": 0, "first_seen": time.time()}
+                camera_locks[camera_id] = threading.Lock()
+            lock = camera_locks[camera_id]
+    cam_stats = stats[camera_id]
+    with lock:
+        cam_stats["frames"] += 1
+        cam_stats["bytes"] += n
+        cam_stats["last_seen"] = last_seen
+        count = cam_stats["frames"]
+
+    if count % LOG_EVERY_N_FRAMES == 1:
+        log.info(
+            f"[{camera_id}] frame #{count:5d}  "
+            f"{n:6d} bytes  "
+            f"ts={timestamp}"
+        )
 
     return jsonify({"status": "ok", "frame": count}), 200
 
 
+STATUS_MAX_AGE_SEC = 0.5
+# (built_at, version, etag, serialized body) of the last /status snapshot
+_status_cache = None
+
+
+def _build_status(now, previous):
+    """Snapshot the stats; reuse previous's body if nothing has changed."""
+    with stats_lock:
+        cameras = list(camera_locks.items())
+    snapshot = {}
+    for camera_id, lock in cameras:
+        with lock:
+            snapshot[camera_id] = dict(stats[camera_id])
+
+    # Frame counts only grow, so (cameras, total frames) changes exactly
+    # when the stats do
+    version = (len(snapshot), sum(cam["frames"] for cam in snapshot.values()))
+    if previous is not None and previous[1] == version:
+        return now, version, previous[2], previous[3]
+    body = orjson.dumps(snapshot) if orjson is not None else json.dumps(snapshot)
+    return now, version, "%d-%d" % version, body
+
+
 @app.route("/status", methods=["GET"])
 def status():
-    """Quick health-check / stats endpoint."""
-    with stats_lock:
-        return jsonify(stats)
+    """
+    Quick health-check / stats endpoint. Served from a snapshot at most
+    STATUS_MAX_AGE_SEC old, so polling it takes no locks in between.
+    """
+    global _status_cache
+    cached = _status_cache
+    now = time.monotonic()
+    if cached is None or now - cached[0] >= STATUS_MAX_AGE_SEC:
+        cached = _status_cache = _build_status(now, cached)
+    response = Response(cached[3], mimetype="application/json")
+    response.set_etag(cached[2])
+    return response.make_conditional(request)
 
 
 @app.route("/latest/<camera_id>", methods=["GET"])
 def latest_frame(camera_id):
     """Serve the latest JPEG for a given camera (useful for debugging)."""
-    filepath = os.path.join(SAVE_DIR, f"{camera_id}_latest.jpg")
+    filepath = _latest_path(camera_id)
     if not os.path.exists(filepath):
         return jsonify({"error": "no frame yet"}), 404
-    return open(filepath, "rb").read(), 200, {"Content-Type": "image/jpeg"}
+    # Streamed from the file (sendfile(2) under servers that support it)
+    return send_file(filepath, mimetype="image/jpeg", conditional=True, max_age=0)
 
 
 if __name__ == "__main__":
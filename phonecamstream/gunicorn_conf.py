@@ -0,0 +1,24 @@
+"""
+Gunicorn settings for frame_receiver — a production threaded server in
+place of the Werkzeug dev server, which closes the connection after every
+request; here the phones' connections stay open between frames.
+
+Usage:
+    pip install flask gunicorn
+    cd phonecamstream
+    gunicorn -c gunicorn_conf.py frame_receiver:app
+"""
+
+bind = "0.0.0.0:5050"
+# Exactly one process: each camera's frames are written by a single writer
+# thread that overwrites <camera>_latest.jpg in place. Nothing pins a phone
+# to one worker (a reconnect or a second URLSession connection can land on
+# another), and two workers writing the same file would interleave frames
+# or let an older frame overwrite a newer one. One process also keeps
+# /status complete. Concurrency comes from threads: the request path is
+# socket reads and queue hand-offs, which release the GIL.
+workers = 1
+worker_class = "gthread"
+threads = 8
+# Phones POST many times a second; hold their connections open between frames
+keepalive = 5
@@ -16,29 +16,129 @@ The iPhones send UDP datagrams to port 5056:
     "heading":    123.4,         // degrees (0 = +x/East, 90 = +y/North)
     "timestamp":  1700000000.123
 }
+
+They may instead send the same fields as a fixed 41-byte binary record
+(network byte order, struct format "!B8s4d"):
+    u8        type tag (1 = camera_state)
+    char[8]   camera_id, NUL-padded UTF-8
+    float64   x, y, heading, timestamp
 """
 
+import selectors
 import socket
+import struct
 import json
 import time
 import sys
 import os
 
+from receiver_log import queue_logger
+from receiver_udp import RECV_BUF_SIZE, udp_socket
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
 # Add repo root so we can import fusion schemas if needed
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
 
 PORT = 5056
+MAX_DRAIN = 32         # datagrams read per select() wakeup
+SO_RCVBUF_BYTES = 8 << 20
+STATS_INTERVAL_SEC = 5.0
+
+# Linux socket options the socket module does not export
+SO_MEMINFO = 55        # u32 counters; index SK_MEMINFO_DROPS is drops
+SK_MEMINFO_DROPS = 8
+
+log = queue_logger("PositionReceiver")
+
+
+# Binary camera_state record; JSON packets are told apart by their leading "{"
+CAMERA_STATE_STRUCT = struct.Struct("!B8s4d")
+MSG_TYPES = {1: "camera_state"}
+
+
+def _parse_packet(data):
+    """
+    Parse one datagram given as a memoryview, JSON (orjson when installed)
+    or a binary CAMERA_STATE_STRUCT record, into the JSON message dict.
+    """
+    if data[:1] != b"{":
+        if len(data) != CAMERA_STATE_STRUCT.size:
+            raise ValueError(f"expected {CAMERA_STATE_STRUCT.size}-byte record, got {len(data)}")
+        tag, camera_id, x, y, heading, timestamp = CAMERA_STATE_STRUCT.unpack_from(data)
+        return {
+            "type": MSG_TYPES.get(tag, "?"),
+            "camera_id": camera_id.rstrip(b"\0").decode("utf-8"),
+            "position": [x, y],
+            "heading": heading,
+            "timestamp": timestamp,
+        }
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(str(data, "utf-8"))
+
+
+def _kernel_drops(sock):
+    """Datagrams the kernel dropped on sock (full buffer), or None if unknown."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        raw = sock.getsockopt(socket.SOL_SOCKET, SO_MEMINFO, 4 * (SK_MEMINFO_DROPS + 1))
+    except OSError:
+        return None
+    if len(raw) < 4 * (SK_MEMINFO_DROPS + 1):
+        return None
+    return struct.unpack_from("I", raw, 4 * SK_MEMINFO_DROPS)[0]
+
+
+def _log_stats(camera_stats, drops):
+    counts = "  ".join(f"{cam}={count}" for cam, count in camera_stats.items())
+    log.info(f"  --- packets: {counts or 'none'}  "
+             f"kernel drops: {'n/a' if drops is None else drops}")
+
+
+def _handle_packet(data, addr, camera_stats):
+    """Parse one datagram, count it per camera and log it."""
+    try:
+        msg = _parse_packet(data)
+    except Exception as e:
+        log.warning(f"  Bad packet from {addr}: {e}")
+        return
+
+    msg_type   = msg.get("type", "?")
+    camera_id  = msg.get("camera_id", "?")
+    position   = msg.get("position", [0, 0])
+    heading    = msg.get("heading", 0)
+    timestamp  = msg.get("timestamp", 0)
+
+    # Track stats
+    if camera_id not in camera_stats:
+        camera_stats[camera_id] = 0
+    camera_stats[camera_id] += 1
+    count = camera_stats[camera_id]
+
+    log.info(
+        f"  [{camera_id}] #{count:5d}  "
+        f"pos=({position[0]:7.2f}, {position[1]:7.2f})  "
+        f"heading={heading:6.1f}°  "
+        f"ts={timestamp:.3f}  "
+        f"from={addr[0]}"
+    )
 
 
 def main():
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind(("0.0.0.0", PORT))
+    sock = udp_socket(PORT, SO_RCVBUF_BYTES)
+    rcvbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
 
     print("=" * 60)
     print("  POSITION RECEIVER")
     print("=" * 60)
     print(f"  Listening on : UDP 0.0.0.0:{PORT}")
+    print(f"  Receive buf  : {rcvbuf // 1024} KB")
     print()
     print("  Expecting JSON packets from iPhones with:")
     print("    type, camera_id, position, heading, timestamp")
@@ -46,34 +146,30 @@ def main():
     print()
 
     camera_stats = {}
-
-    while True:
-        data, addr = sock.recvfrom(65535)
-        try:
-            msg = json.loads(data.decode("utf-8"))
-        except Exception as e:
-            print(f"  Bad packet from {addr}: {e}")
-            continue
-
-        msg_type   = msg.get("type", "?")
-        camera_id  = msg.get("camera_id", "?")
-        position   = msg.get("position", [0, 0])
-        heading    = msg.get("heading", 0)
-        timestamp  = msg.get("timestamp", 0)
-
-        # Track stats
-        if camera_id not in camera_stats:
-            camera_stats[camera_id] = 0
-        camera_stats[camera_id] += 1
-        count = camera_stats[camera_id]
-
-        print(
-            f"  [{camera_id}] #{count:5d}  "
-            f"pos=({position[0]:7.2f}, {position[1]:7.2f})  "
-            f"heading={heading:6.1f}°  "
-            f"ts={timestamp:.3f}  "
-            f"from={addr[0]}"
-        )
+    buf = bytearray(RECV_BUF_SIZE)
+    view = memoryview(buf)
+
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    # Packet counts and kernel drops are logged from the same loop whenever
+    # the select timeout for them comes due
+    next_stats = time.monotonic() + STATS_INTERVAL_SEC
+    try:
+        while True:
+            sel.select(max(0.0, next_stats - time.monotonic()))
+            # One wakeup drains whatever has queued up, capped so a flood
+            # cannot keep the loop from ever returning to select()
+            for _ in range(MAX_DRAIN):
+                try:
+                    n, addr = sock.recvfrom_into(buf)
+                except BlockingIOError:
+                    break
+                _handle_packet(view[:n], addr, camera_stats)
+            if time.monotonic() >= next_stats:
+                _log_stats(camera_stats, _kernel_drops(sock))
+                next_stats = time.monotonic() + STATS_INTERVAL_SEC
+    finally:
+        sel.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""
+Logging for the receiver scripts: the hot path only enqueues records and
+one listener thread writes them to stdout, so a slow console never blocks
+a request or a socket read.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import queue
+import sys
+
+
+def queue_logger(name):
+    """INFO-level logger `name` whose records reach stdout via a listener thread."""
+    log = logging.getLogger(name)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    records = queue.SimpleQueue()
+    log.addHandler(QueueHandler(records))
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(records, stdout_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return log
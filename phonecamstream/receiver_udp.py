@@ -0,0 +1,44 @@
+"""
+UDP sockets for the receiver scripts. Each socket gets a large kernel
+receive buffer so a burst of datagrams waits there instead of being
+dropped, and each script receives into one reusable RECV_BUF_SIZE buffer
+rather than allocating a fresh bytes object per datagram.
+"""
+
+import socket
+import sys
+
+RECV_BUF_SIZE = 65535  # max UDP payload
+
+# Linux socket option the socket module does not export
+SO_RCVBUFFORCE = 33    # like SO_RCVBUF but may exceed rmem_max (root only)
+
+
+def set_rcvbuf(sock, size):
+    """
+    Ask for a size-byte kernel receive buffer and return what was granted.
+    Linux clamps to rmem_max (lifted by SO_RCVBUFFORCE when root); macOS
+    rejects sizes above kern.ipc.maxsockbuf, so retry smaller there.
+    """
+    while size >= 64 * 1024:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+            break
+        except OSError:
+            size //= 2
+    if sys.platform.startswith("linux"):
+        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) < size:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, SO_RCVBUFFORCE, size)
+            except OSError:
+                pass  # not root; keep the clamped size
+    return sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+
+def udp_socket(port, rcvbuf_bytes):
+    """Non-blocking UDP socket bound to port with a rcvbuf_bytes receive buffer."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("0.0.0.0", port))
+    sock.setblocking(False)
+    set_rcvbuf(sock, rcvbuf_bytes)
+    return sock
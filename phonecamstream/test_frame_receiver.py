@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for frame_receiver's per-camera writer threads.
+
+Run from phonecamstream/:  python test_frame_receiver.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["FRAME_SAVE_DIR"] = tempfile.mkdtemp(prefix="frame_receiver_test_")
+
+import frame_receiver as fr
+
+
+def _post(client, camera_id, data):
+    return client.post("/frame", data=data, headers={"X-Camera-Id": camera_id, "X-Timestamp": "1.5"})
+
+
+def _wait_for_frame(camera_id, data, timeout=2.0):
+    path = fr._latest_path(camera_id)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return True
+        time.sleep(0.01)
+    return False
+
+
+def _raise(exc):
+    def fail(*args, **kwargs):
+        raise exc
+    return fail
+
+
+def test_failed_decode_still_writes_jpeg():
+    client = fr.app.test_client()
+    saved = fr._turbojpeg, fr._write_decoded
+    fr._turbojpeg = object()  # take the decode path even without PyTurboJPEG
+    try:
+        for camera_id, exc in (("decode_oserror", OSError("Corrupt JPEG data")),
+                               ("decode_valueerror", ValueError("bad frame"))):
+            fr._write_decoded = _raise(exc)
+            for i in range(5):
+                frame = b"frame %d" % i
+                assert _post(client, camera_id, frame).status_code == 200
+                assert _wait_for_frame(camera_id, frame)
+    finally:
+        fr._turbojpeg, fr._write_decoded = saved
+
+
+def test_writer_survives_failed_write():
+    client = fr.app.test_client()
+    saved = fr._latest_fd
+    fr._latest_fd = _raise(RuntimeError("disk gone"))
+    try:
+        assert _post(client, "write_error", b"lost").status_code == 200
+        time.sleep(0.05)
+    finally:
+        fr._latest_fd = saved
+    for i in range(5):
+        frame = b"after %d" % i
+        assert _post(client, "write_error", frame).status_code == 200
+        assert _wait_for_frame("write_error", frame)
+
+
+if __name__ == "__main__":
+    test_failed_decode_still_writes_jpeg()
+    test_writer_survives_failed_write()
+    print("OK: frame writer verified.")